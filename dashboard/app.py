@@ -4,111 +4,237 @@ import plotly.graph_objects as go # type: ignore
 import pandas as pd
 import numpy as np
 from datetime import timedelta
+import os
+import json
+import sqlite3
+import threading
+import time
 
 # Initialize app
 app = dash.Dash(__name__)
 app.title = "AgriSense Dashboard"
+server = app.server  # gunicorn ke liye: gunicorn -w 4 dashboard.app:server
 
-# Load data with error handling
-try:
-    df = pd.read_csv("processed_data/featured_data.csv")
-    df['date'] = pd.to_datetime(df['date'], errors='coerce')
-    df = df.dropna(subset=['date', 'modal_price'])
-    df = df.sort_values(['commodity', 'date'])
-    print(f"Data loaded: {len(df)} rows, {df['commodity'].nunique()} commodities")
-except Exception as e:
-    print(f"Error loading data: {e}")
-    df = pd.DataFrame()
+DATA_CSV = "processed_data/featured_data.csv"
+DATA_ARROW = "processed_data/dashboard_data.arrow"
+SPREADS_CSV = "processed_data/market_spreads.csv"
+ONLINE_FEATURES_CSV = "processed_data/online_features.csv"
+SPREAD_PAIRS_CSV = "processed_data/market_spread_pairs.csv"
 
-# Get unique commodities
-commodities = sorted(df['commodity'].unique().tolist()) if not df.empty else []
+def load_dataset():
+    """
+    Published Arrow file (scripts/publish_dashboard_data.py) ho to use read-only
+    memory-map karo - sab gunicorn workers OS page cache ki ek hi copy share
+    karte hain. Arrow file na ho ya CSV se purani ho to CSV parse karo.
+    Returns (table, offsets, df): Arrow mode mein df None, CSV mode mein table None.
+    """
+    use_arrow = os.environ.get('AGRISENSE_DATA_MODE', 'auto') != 'csv'
+    if use_arrow and os.path.exists(DATA_ARROW) and (
+            not os.path.exists(DATA_CSV) or
+            os.path.getmtime(DATA_ARROW) >= os.path.getmtime(DATA_CSV)):
+        try:
+            import pyarrow as pa # type: ignore
+            
+            table = pa.ipc.open_file(pa.memory_map(DATA_ARROW, 'r')).read_all()
+            offsets = json.loads(table.schema.metadata[b'agrisense_offsets'])
+            print(f"Data mapped: {table.num_rows} rows, {len(offsets)} commodities")
+            return table, offsets, None
+        except Exception as e:
+            print(f"Error mapping {DATA_ARROW}, falling back to CSV: {e}")
+    
+    try:
+        df = pd.read_csv(DATA_CSV)
+        df['date'] = pd.to_datetime(df['date'], errors='coerce')
+        df = df.dropna(subset=['date', 'modal_price'])
+        df = df.sort_values(['commodity', 'date'])
+        print(f"Data loaded: {len(df)} rows, {df['commodity'].nunique()} commodities")
+        return None, None, df
+    except Exception as e:
+        print(f"Error loading data: {e}")
+        return None, None, pd.DataFrame()
 
-# Dashboard layout
-app.layout = html.Div([
-    html.Div([
-        html.H1("🌾 AgriSense - Indian Agriculture Analytics", 
-                style={
-                    'textAlign': 'center', 
-                    'color': '#2E7D32',
-                    'padding': '15px',
-                    'backgroundColor': '#F1F8E9',
-                    'margin': '0 0 20px 0',
-                    'borderRadius': '8px',
-                    'fontSize': '28px'
-                })
-    ]),
+# Data background thread mein load hota hai taaki server turant connections le sake
+# (health check /health par ready/not-ready dikhta hai)
+table, offsets, df = None, None, pd.DataFrame()
+commodities = []
+spreads, spread_pairs = pd.DataFrame(), pd.DataFrame()
+data_ready = threading.Event()
+
+def load_spreads():
+    """scripts/spread_analytics.py ke persisted spread tables"""
+    try:
+        loaded_spreads = pd.read_csv(SPREADS_CSV, parse_dates=['date'])
+        loaded_pairs = pd.read_csv(SPREAD_PAIRS_CSV, parse_dates=['date'])
+        print(f"Spreads loaded: {len(loaded_spreads)} commodity-days")
+        return loaded_spreads, loaded_pairs
+    except Exception as e:
+        print(f"Spread tables not available: {e}")
+        return pd.DataFrame(), pd.DataFrame()
+
+def _load_in_background():
+    global table, offsets, df, commodities, spreads, spread_pairs
+    start = time.perf_counter()
+    loaded_table, loaded_offsets, loaded_df = load_dataset()
+    spreads, spread_pairs = load_spreads()
     
-    html.Div([
-        html.H3("📊 Commodity Price Trends", 
-                style={'color': '#1B5E20', 'marginBottom': '10px', 'fontSize': '20px'}),
-        dcc.Dropdown(
-            id='commodity-dropdown',
-            options=[{'label': c, 'value': c} for c in commodities],
-            value=commodities[0] if commodities else None,
-            clearable=False,
-            style={'marginBottom': '15px'}
-        ),
-        dcc.Graph(id='price-trend-graph', config={'displayModeBar': False})
-    ], style={
-        'marginBottom': '25px', 
-        'padding': '15px', 
-        'backgroundColor': '#FFFFFF', 
-        'borderRadius': '8px', 
-        'boxShadow': '0 2px 4px rgba(0,0,0,0.08)'
-    }),
+    if loaded_table is not None:
+        loaded_commodities = sorted(loaded_offsets)
+    else:
+        loaded_commodities = sorted(loaded_df['commodity'].unique().tolist()) if not loaded_df.empty else []
     
-    html.Div([
-        html.H3("🗺️ State-wise Price Comparison", 
-                style={'color': '#1B5E20', 'marginBottom': '10px', 'fontSize': '20px'}),
-        dcc.Dropdown(
-            id='state-commodity-dropdown',
-            options=[{'label': c, 'value': c} for c in commodities],
-            value=commodities[0] if commodities else None,
-            clearable=False,
-            style={'marginBottom': '15px'}
-        ),
-        dcc.Graph(id='state-comparison-graph', config={'displayModeBar': False})
-    ], style={
-        'marginBottom': '25px', 
-        'padding': '15px', 
-        'backgroundColor': '#FFFFFF', 
-        'borderRadius': '8px', 
-        'boxShadow': '0 2px 4px rgba(0,0,0,0.08)'
-    }),
+    table, offsets, df = loaded_table, loaded_offsets, loaded_df
+    commodities = loaded_commodities
+    data_ready.set()
+    print(f"Data ready in {time.perf_counter() - start:.2f}s")
+
+threading.Thread(target=_load_in_background, name='agrisense-data-loader', daemon=True).start()
+
+@server.route('/health')
+def health():
+    status = {
+        'status': 'ready' if data_ready.is_set() else 'loading',
+        'commodities': len(commodities),
+        'pid': os.getpid()
+    }
+    return json.dumps(status), (200 if data_ready.is_set() else 503), {'Content-Type': 'application/json'}
+
+def get_commodity_df(commodity):
+    """Ek commodity ki rows (Arrow mode mein zero-copy slice, sirf wahi materialize hota hai)"""
+    if table is not None:
+        start, length = offsets.get(commodity, (0, 0))
+        return table.slice(start, length).to_pandas()
+    return df[df['commodity'] == commodity]
+
+# Dashboard layout (function hai taaki har page load par current data ke options mile)
+def serve_layout():
+    spread_commodities = sorted(spreads['commodity'].unique().tolist()) if not spreads.empty else []
+    return html.Div([
+        html.Div([
+            html.H1("🌾 AgriSense - Indian Agriculture Analytics", 
+                    style={
+                        'textAlign': 'center', 
+                        'color': '#2E7D32',
+                        'padding': '15px',
+                        'backgroundColor': '#F1F8E9',
+                        'margin': '0 0 20px 0',
+                        'borderRadius': '8px',
+                        'fontSize': '28px'
+                    })
+        ]),
     
-    html.Div([
-        html.H3("📈 Price Prediction (Next 7 Days)", 
-                style={'color': '#1B5E20', 'marginBottom': '10px', 'fontSize': '20px'}),
-        dcc.Dropdown(
-            id='prediction-commodity-dropdown',
-            options=[{'label': c, 'value': c} for c in commodities],
-            value=commodities[0] if commodities else None,
-            clearable=False,
-            style={'marginBottom': '15px'}
+        html.Div(
+            "⏳ Data is still loading, refresh in a moment..." if not data_ready.is_set() else "",
+            style={'textAlign': 'center', 'color': '#E65100', 'marginBottom': '10px'}
         ),
-        dcc.Graph(id='prediction-graph', config={'displayModeBar': False})
-    ], style={
-        'marginBottom': '25px', 
-        'padding': '15px', 
-        'backgroundColor': '#FFFFFF', 
-        'borderRadius': '8px', 
-        'boxShadow': '0 2px 4px rgba(0,0,0,0.08)'
-    }),
     
-], style={'padding': '15px', 'backgroundColor': '#E8F5E9', 'minHeight': '100vh'})
+        html.Div([
+            html.H3("📊 Commodity Price Trends", 
+                    style={'color': '#1B5E20', 'marginBottom': '10px', 'fontSize': '20px'}),
+            dcc.Dropdown(
+                id='commodity-dropdown',
+                options=[{'label': c, 'value': c} for c in commodities],
+                value=commodities[0] if commodities else None,
+                clearable=False,
+                style={'marginBottom': '15px'}
+            ),
+            dcc.Graph(id='price-trend-graph', config={'displayModeBar': False})
+        ], style={
+            'marginBottom': '25px', 
+            'padding': '15px', 
+            'backgroundColor': '#FFFFFF', 
+            'borderRadius': '8px', 
+            'boxShadow': '0 2px 4px rgba(0,0,0,0.08)'
+        }),
+    
+        html.Div([
+            html.H3("🗺️ State-wise Price Comparison", 
+                    style={'color': '#1B5E20', 'marginBottom': '10px', 'fontSize': '20px'}),
+            dcc.Dropdown(
+                id='state-commodity-dropdown',
+                options=[{'label': c, 'value': c} for c in commodities],
+                value=commodities[0] if commodities else None,
+                clearable=False,
+                style={'marginBottom': '15px'}
+            ),
+            dcc.Graph(id='state-comparison-graph', config={'displayModeBar': False})
+        ], style={
+            'marginBottom': '25px', 
+            'padding': '15px', 
+            'backgroundColor': '#FFFFFF', 
+            'borderRadius': '8px', 
+            'boxShadow': '0 2px 4px rgba(0,0,0,0.08)'
+        }),
+    
+        html.Div([
+            html.H3("📈 Price Prediction (Next 7 Days)", 
+                    style={'color': '#1B5E20', 'marginBottom': '10px', 'fontSize': '20px'}),
+            dcc.Dropdown(
+                id='prediction-commodity-dropdown',
+                options=[{'label': c, 'value': c} for c in commodities],
+                value=commodities[0] if commodities else None,
+                clearable=False,
+                style={'marginBottom': '15px'}
+            ),
+            dcc.Graph(id='prediction-graph', config={'displayModeBar': False}),
+            html.Div(id='online-features-table')
+        ], style={
+            'marginBottom': '25px', 
+            'padding': '15px', 
+            'backgroundColor': '#FFFFFF', 
+            'borderRadius': '8px', 
+            'boxShadow': '0 2px 4px rgba(0,0,0,0.08)'
+        }),
+    
+        html.Div([
+            html.H3("🚨 Active Price-Spike Alerts", 
+                    style={'color': '#B71C1C', 'marginBottom': '10px', 'fontSize': '20px'}),
+            html.Div(id='alerts-table'),
+            dcc.Interval(id='alerts-interval', interval=60 * 1000, n_intervals=0)
+        ], style={
+            'marginBottom': '25px', 
+            'padding': '15px', 
+            'backgroundColor': '#FFFFFF', 
+            'borderRadius': '8px', 
+            'boxShadow': '0 2px 4px rgba(0,0,0,0.08)'
+        }),
+    
+        html.Div([
+            html.H3("↔️ Cross-Market Price Spreads", 
+                    style={'color': '#1B5E20', 'marginBottom': '10px', 'fontSize': '20px'}),
+            dcc.Dropdown(
+                id='spread-commodity-dropdown',
+                options=[{'label': c, 'value': c} for c in spread_commodities],
+                value=spread_commodities[0] if spread_commodities else None,
+                clearable=False,
+                style={'marginBottom': '15px'}
+            ),
+            dcc.Graph(id='spread-graph', config={'displayModeBar': False}),
+            html.Div(id='spread-pairs-table')
+        ], style={
+            'marginBottom': '25px', 
+            'padding': '15px', 
+            'backgroundColor': '#FFFFFF', 
+            'borderRadius': '8px', 
+            'boxShadow': '0 2px 4px rgba(0,0,0,0.08)'
+        }),
+    
+    ], style={'padding': '15px', 'backgroundColor': '#E8F5E9', 'minHeight': '100vh'})
+
+app.layout = serve_layout
 
 @app.callback(
     Output('price-trend-graph', 'figure'),
     Input('commodity-dropdown', 'value')
 )
 def update_price_trend(selected_commodity):
-    if df.empty or not selected_commodity:
+    if not commodities or not selected_commodity:
         fig = go.Figure()
-        fig.add_annotation(text="No data available", showarrow=False, font=dict(size=16))
+        message = "No data available" if data_ready.is_set() else "Data loading..."
+        fig.add_annotation(text=message, showarrow=False, font=dict(size=16))
         return fig
     
     try:
-        filtered_df = df[df['commodity'] == selected_commodity].copy()
+        filtered_df = get_commodity_df(selected_commodity).copy()
         
         if len(filtered_df) > 90:
             filtered_df = filtered_df.tail(90)
@@ -158,13 +284,14 @@ def update_price_trend(selected_commodity):
     Input('state-commodity-dropdown', 'value')
 )
 def update_state_comparison(selected_commodity):
-    if df.empty or not selected_commodity:
+    if not commodities or not selected_commodity:
         fig = go.Figure()
-        fig.add_annotation(text="No data available", showarrow=False, font=dict(size=16))
+        message = "No data available" if data_ready.is_set() else "Data loading..."
+        fig.add_annotation(text=message, showarrow=False, font=dict(size=16))
         return fig
     
     try:
-        filtered_df = df[df['commodity'] == selected_commodity]
+        filtered_df = get_commodity_df(selected_commodity)
         
         if 'state' not in filtered_df.columns:
             fig = go.Figure()
@@ -209,13 +336,14 @@ def update_state_comparison(selected_commodity):
     Input('prediction-commodity-dropdown', 'value')
 )
 def update_prediction(selected_commodity):
-    if df.empty or not selected_commodity:
+    if not commodities or not selected_commodity:
         fig = go.Figure()
-        fig.add_annotation(text="No data available", showarrow=False, font=dict(size=16))
+        message = "No data available" if data_ready.is_set() else "Data loading..."
+        fig.add_annotation(text=message, showarrow=False, font=dict(size=16))
         return fig
     
     try:
-        filtered_df = df[df['commodity'] == selected_commodity].copy()
+        filtered_df = get_commodity_df(selected_commodity).copy()
         
         if len(filtered_df) < 2:
             fig = go.Figure()
@@ -282,6 +410,167 @@ def update_prediction(selected_commodity):
         fig.add_annotation(text=f"Prediction error: {str(e)}", showarrow=False, font=dict(size=14))
         return fig
 
+@app.callback(
+    Output('online-features-table', 'children'),
+    Input('prediction-commodity-dropdown', 'value'),
+    Input('alerts-interval', 'n_intervals')
+)
+def update_online_features(selected_commodity, _):
+    # Snapshot chhota hai aur ingest se badalta rehta hai, isliye har refresh par padho
+    if not selected_commodity or not os.path.exists(ONLINE_FEATURES_CSV):
+        return None
+    
+    try:
+        online = pd.read_csv(ONLINE_FEATURES_CSV)
+        online = online[online['commodity'] == selected_commodity]
+        if online.empty:
+            return None
+        online = online.sort_values('date', ascending=False).head(10)
+        
+        header = ['Market', 'State', 'Last Date', 'Price', '7-Day Avg', '30-Day Avg', 'Volatility', 'Model Prediction']
+        fmt = lambda v: f'₹{v:.2f}' if pd.notna(v) else '-'
+        rows = [
+            html.Tr([
+                html.Td(r.market), html.Td(r.state), html.Td(str(r.date)[:10]),
+                html.Td(fmt(r.modal_price)), html.Td(fmt(r.price_7day_avg)),
+                html.Td(fmt(r.price_30day_avg)), html.Td(f'{r.volatility:.2f}'),
+                html.Td(fmt(r.predicted_price))
+            ]) for r in online.itertuples()
+        ]
+        return html.Div([
+            html.P("Latest online features per market (scripts/feature_store.py)",
+                   style={'color': '#1B5E20', 'fontWeight': 'bold', 'margin': '10px 0 5px 0'}),
+            html.Table(
+                [html.Thead(html.Tr([html.Th(h) for h in header]))] + [html.Tbody(rows)],
+                style={'width': '100%', 'borderCollapse': 'collapse', 'fontSize': '14px'}
+            )
+        ])
+    except Exception as e:
+        print(f"Error loading online features: {e}")
+        return None
+
+@app.callback(
+    Output('alerts-table', 'children'),
+    Input('alerts-interval', 'n_intervals')
+)
+def update_alerts(_):
+    db_path = "processed_data/alerts.db"
+    if not os.path.exists(db_path):
+        return html.P("No alerts yet (run scripts/price_alerts.py)", style={'color': '#757575'})
+    
+    try:
+        # Latest alert date se pichhle 7 din ke alerts "active" maane jaate hain
+        with sqlite3.connect(db_path) as conn:
+            alerts = pd.read_sql_query(
+                "SELECT commodity, state, market, date, price, expected_price, robust_z, change_pct "
+                "FROM alerts WHERE date >= date((SELECT MAX(date) FROM alerts), '-7 days') "
+                "ORDER BY date DESC, robust_z DESC LIMIT 25",
+                conn
+            )
+        
+        if alerts.empty:
+            return html.P("No active alerts", style={'color': '#757575'})
+        
+        header = ['Date', 'Commodity', 'Market', 'State', 'Price', 'Expected', 'Change', 'Z-Score']
+        rows = [
+            html.Tr([
+                html.Td(r.date), html.Td(r.commodity), html.Td(r.market), html.Td(r.state),
+                html.Td(f'₹{r.price:.2f}'), html.Td(f'₹{r.expected_price:.2f}'),
+                html.Td(f'{r.change_pct:+.1f}%'), html.Td(f'{r.robust_z:.1f}')
+            ]) for r in alerts.itertuples()
+        ]
+        return html.Table(
+            [html.Thead(html.Tr([html.Th(h) for h in header]))] + [html.Tbody(rows)],
+            style={'width': '100%', 'borderCollapse': 'collapse', 'fontSize': '14px'}
+        )
+    except Exception as e:
+        print(f"Error loading alerts: {e}")
+        return html.P(f"Error: {str(e)}", style={'color': '#B71C1C'})
+
+def market_label(market, state):
+    """Same market naam alag states mein ho sakta hai, isliye 'Market, State'"""
+    return f"{market}, {state}" if pd.notna(state) else str(market)
+
+@app.callback(
+    Output('spread-graph', 'figure'),
+    Output('spread-pairs-table', 'children'),
+    Input('spread-commodity-dropdown', 'value')
+)
+def update_spreads(selected_commodity):
+    if spreads.empty or not selected_commodity:
+        fig = go.Figure()
+        message = "No spread data (run scripts/spread_analytics.py)" if data_ready.is_set() else "Data loading..."
+        fig.add_annotation(text=message, showarrow=False, font=dict(size=16))
+        return fig, None
+    
+    try:
+        daily = spreads[spreads['commodity'] == selected_commodity].sort_values('date').tail(90).copy()
+        for side in ['cheapest', 'costliest']:
+            daily[f'{side}_label'] = [market_label(m, st) for m, st in
+                                      zip(daily[f'{side}_market'], daily.get(f'{side}_state', [None] * len(daily)))]
+        
+        fig = go.Figure()
+        fig.add_trace(go.Bar(
+            x=daily['date'],
+            y=daily['spread'],
+            name='Max - Min Spread',
+            marker=dict(color='#A5D6A7'),
+            customdata=daily[['cheapest_label', 'costliest_label', 'markets']],
+            hovertemplate='<b>%{x|%d %b %Y}</b><br>Spread: ₹%{y:.2f}<br>'
+                          'Cheapest: %{customdata[0]}<br>Costliest: %{customdata[1]}<br>'
+                          'Markets: %{customdata[2]}<extra></extra>'
+        ))
+        if 'spread_7day_avg' in daily.columns:
+            fig.add_trace(go.Scatter(
+                x=daily['date'],
+                y=daily['spread_7day_avg'],
+                mode='lines',
+                name='7-Day Avg Spread',
+                line=dict(color='#1B5E20', width=2),
+                hovertemplate='<b>%{x|%d %b %Y}</b><br>Avg: ₹%{y:.2f}<extra></extra>'
+            ))
+        
+        fig.update_layout(
+            title=dict(text=f"<b>{selected_commodity}</b> - Daily Price Spread Across Markets", font=dict(size=18)),
+            xaxis_title="Date",
+            yaxis_title="Spread (₹/Quintal)",
+            hovermode='x unified',
+            template='plotly_white',
+            height=400,
+            margin=dict(l=50, r=30, t=50, b=50),
+            showlegend=True,
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+        )
+        
+        # Latest din ke widest market pairs
+        pairs = spread_pairs[spread_pairs['commodity'] == selected_commodity]
+        if pairs.empty:
+            return fig, None
+        latest = pairs[pairs['date'] == pairs['date'].max()].sort_values('rank')
+        header = ['#', 'Buy Market', 'Buy Price', 'Sell Market', 'Sell Price', 'Spread']
+        rows = [
+            html.Tr([
+                html.Td(r.rank), html.Td(market_label(r.buy_market, getattr(r, 'buy_state', None))),
+                html.Td(f'₹{r.buy_price:.2f}'),
+                html.Td(market_label(r.sell_market, getattr(r, 'sell_state', None))),
+                html.Td(f'₹{r.sell_price:.2f}'), html.Td(f'₹{r.spread:.2f}')
+            ]) for r in latest.itertuples()
+        ]
+        table_div = html.Div([
+            html.P(f"Widest market pairs on {latest['date'].iloc[0]:%d %b %Y}",
+                   style={'color': '#1B5E20', 'fontWeight': 'bold', 'margin': '10px 0 5px 0'}),
+            html.Table(
+                [html.Thead(html.Tr([html.Th(h) for h in header]))] + [html.Tbody(rows)],
+                style={'width': '100%', 'borderCollapse': 'collapse', 'fontSize': '14px'}
+            )
+        ])
+        return fig, table_div
+    except Exception as e:
+        print(f"Error in spreads: {e}")
+        fig = go.Figure()
+        fig.add_annotation(text=f"Error: {str(e)}", showarrow=False, font=dict(size=14))
+        return fig, None
+
 if __name__ == '__main__':
     print("\nStarting AgriSense Dashboard...")
     print("Open browser at: http://localhost:8050\n")
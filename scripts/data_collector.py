@@ -4,6 +4,7 @@ from datetime import datetime
 import os
 from dotenv import load_dotenv
 import time
+import argparse
 
 # Load environment variables
 load_dotenv()
@@ -92,6 +93,7 @@ class DataCollector:
                         'temperature': data['main']['temp'],
                         'humidity': data['main']['humidity'],
                         'pressure': data['main']['pressure'],
+                        'rainfall': data.get('rain', {}).get('1h', 0.0),
                         'weather': data['weather'][0]['description'],
                         'timestamp': datetime.now()
                     })
@@ -130,17 +132,22 @@ class DataCollector:
             return False
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AgriSense data collection (crop prices + weather)")
+    parser.add_argument('--check-internet', action='store_true',
+                        help="pehle google.com se connectivity check karo (default off, startup block nahi hota)")
+    args = parser.parse_args()
+    
     print("🚀 Starting data collection...\n")
     
     collector = DataCollector()
     
-    # Test connection with a simple request
-    print("🔍 Testing internet connectivity...")
-    try:
-        requests.get("https://www.google.com", timeout=5)
-        print("✅ Internet connection OK\n")
-    except:
-        print("❌ No internet connection detected\n")
+    if args.check_internet:
+        print("🔍 Testing internet connectivity...")
+        try:
+            requests.get("https://www.google.com", timeout=5)
+            print("✅ Internet connection OK\n")
+        except:
+            print("❌ No internet connection detected\n")
     
     # Fetch crop data
     crop_df = collector.fetch_crop_data()
@@ -3,11 +3,19 @@ import numpy as np
 from datetime import datetime, timedelta
 import os
 import random
+from weather_join import WeatherJoiner
+from entity_normalizer import EntityNormalizer
+from data_quality import DataQualityValidator
+from publish_dashboard_data import publish_dashboard_data
+from spread_analytics import MarketSpreadAnalyzer
+from feature_store import FeatureStateStore
 
 class AgriSenseDataManager:
     def __init__(self):
         self.raw_path = "raw_data"
         self.processed_path = "processed_data"
+        self.normalizer = EntityNormalizer()
+        self.validator = DataQualityValidator(known_states=self.normalizer.canonical['state'])
         
         # Create directories
         os.makedirs(self.raw_path, exist_ok=True)
@@ -77,30 +85,21 @@ class AgriSenseDataManager:
             df = pd.read_csv(filepath)
             
             # Data cleaning steps
-            # 1. Missing values handle karo
-            df = df.dropna(subset=['commodity', 'market', 'price'])
-            print(f"✅ After removing missing values: {len(df)} rows")
-            
-            # 2. Date format standardize karo
+            # 1. Date format standardize karo
             df['date'] = pd.to_datetime(df['arrival_date'], errors='coerce')
             
-            # 3. Price ko numeric convert karo
-            df['modal_price'] = pd.to_numeric(df['modal_price'], errors='coerce')
-            df = df.dropna(subset=['modal_price'])
-            
-            # 4. Outliers remove karo (IQR method)
-            Q1 = df['modal_price'].quantile(0.25)
-            Q3 = df['modal_price'].quantile(0.75)
-            IQR = Q3 - Q1
+            # 2. Prices ko numeric convert karo
+            for col in ['modal_price', 'min_price', 'max_price']:
+                if col in df.columns:
+                    df[col] = pd.to_numeric(df[col], errors='coerce')
             
-            if IQR > 0:
-                df = df[~((df['modal_price'] < (Q1 - 1.5 * IQR)) | 
-                          (df['modal_price'] > (Q3 + 1.5 * IQR)))]
-                print(f"✅ After removing outliers: {len(df)} rows")
+            # 3. Entity names normalize karo (alias table, sirf unique values par)
+            df = self.normalizer.normalize(df)
             
-            # 5. State-wise aggregation
-            df['state'] = df['state'].str.strip().str.title()
-            df['commodity'] = df['commodity'].str.strip().str.title()
+            # 4. Data-quality rules ek pass mein (missing values, galat prices,
+            #    future dates, unknown states, IQR outliers) - failing rows quarantine
+            df, _ = self.validator.split(df, source=os.path.basename(filepath))
+            print(f"✅ After data-quality checks: {len(df)} rows")
             
             # Save processed data
             output_file = f"{self.processed_path}/clean_commodity_prices.csv"
@@ -112,25 +111,29 @@ class AgriSenseDataManager:
             print(f"❌ Error in cleaning: {e}")
             return None
     
-    def create_features(self, df):
+    def create_features(self, df, group_cols=None, save=True):
         """
         ML ke liye features engineer karo
+        (group_cols default 'commodity'; FeatureStateStore ke saath compare
+        karne ke liye (commodity, state, market) bhi pass kar sakte ho)
         """
         try:
             print(f"\n🔧 Creating features...")
+            if group_cols is None:
+                group_cols = ['commodity']
             df = df.copy()
-            df = df.sort_values(['commodity', 'date'])
+            df = df.sort_values(group_cols + ['date'])
             
             # 1. Rolling averages (7-day, 30-day)
-            df['price_7day_avg'] = df.groupby('commodity')['modal_price'].transform(
+            df['price_7day_avg'] = df.groupby(group_cols)['modal_price'].transform(
                 lambda x: x.rolling(window=7, min_periods=1).mean()
             )
-            df['price_30day_avg'] = df.groupby('commodity')['modal_price'].transform(
+            df['price_30day_avg'] = df.groupby(group_cols)['modal_price'].transform(
                 lambda x: x.rolling(window=30, min_periods=1).mean()
             )
             
             # 2. Price change percentage
-            df['price_change_pct'] = df.groupby('commodity')['modal_price'].pct_change() * 100
+            df['price_change_pct'] = df.groupby(group_cols)['modal_price'].pct_change() * 100
             df['price_change_pct'] = df['price_change_pct'].fillna(0)
             
             # 3. Seasonality features
@@ -140,7 +143,7 @@ class AgriSenseDataManager:
             df['week_of_year'] = df['date'].dt.isocalendar().week
             
             # 4. Volatility index
-            df['volatility'] = df.groupby('commodity')['modal_price'].transform(
+            df['volatility'] = df.groupby(group_cols)['modal_price'].transform(
                 lambda x: x.rolling(window=30, min_periods=1).std()
             )
             df['volatility'] = df['volatility'].fillna(0)
@@ -153,6 +156,9 @@ class AgriSenseDataManager:
             df['trend'] = np.where(df['price_change_pct'] > 2, 'Rising',
                                    np.where(df['price_change_pct'] < -2, 'Falling', 'Stable'))
             
+            if not save:
+                return df
+            
             output_file = f"{self.processed_path}/featured_data.csv"
             df.to_csv(output_file, index=False)
             print(f"✅ Featured data saved: {output_file}")
@@ -219,6 +225,9 @@ if __name__ == "__main__":
     clean_df = manager.clean_commodity_data(filepath)
     
     if clean_df is not None:
+        # Step 2b: Weather join (nearest station, as-of arrival date)
+        clean_df = WeatherJoiner().join_weather(clean_df)
+        
         # Step 3: Create features
         print("\nStep 3: Feature Engineering")
         print("-"*50)
@@ -230,12 +239,24 @@ if __name__ == "__main__":
             print("-"*50)
             manager.generate_insights(featured_df)
             
+            # Step 5: Cross-market spreads (order statistics, self-join nahi)
+            MarketSpreadAnalyzer().compute(clean_df)
+            
+            # Step 6: Online feature state (naye arrivals feature_store.py ingest se aate hain)
+            FeatureStateStore().rebuild(clean_df).save()
+            
+            # Step 7: Dashboard dataset publish (memory-mapped Arrow)
+            publish_dashboard_data()
+            
             print("\n" + "="*50)
             print("✨ Pipeline completed successfully!")
             print("="*50)
             print(f"\n📁 Output Files:")
             print(f"   1. {manager.processed_path}/clean_commodity_prices.csv")
             print(f"   2. {manager.processed_path}/featured_data.csv")
+            print(f"   3. {manager.processed_path}/market_spreads.csv")
+            print(f"   4. {manager.processed_path}/online_features.csv")
+            print(f"   5. {manager.processed_path}/dashboard_data.arrow")
         else:
             print("\n⚠️  Feature creation failed")
     else:
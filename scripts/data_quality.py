@@ -0,0 +1,219 @@
+import pandas as pd
+import numpy as np
+from datetime import datetime
+import glob
+import os
+
+
+class DataQualityValidator:
+    """
+    Vectorized data-quality rule engine.
+    Har rule ek bit hai; har row ke liye saare failures ek uint32 bitmask mein
+    record hote hain. Failing rows har source ki apni quarantine file mein jaati hain
+    (gaayab nahi; pyarrow ho to Parquet, warna CSV), aur saare sources ki
+    rule/source/commodity wise summary banti hai.
+    """
+
+    # Rule name -> bit position (order mat badlo, purane quarantine files isi par decode hote hain)
+    RULES = {
+        'missing_required': 0,     # commodity/market/modal_price missing
+        'invalid_date': 1,         # arrival_date parse nahi hua
+        'future_date': 2,          # arrival_date aaj ke baad
+        'non_positive_price': 3,   # min/modal/max price <= 0
+        'min_gt_modal': 4,         # min_price > modal_price
+        'modal_gt_max': 5,         # modal_price > max_price
+        'unknown_state': 6,        # state canonical list mein nahi
+        'price_outlier': 7,        # modal_price IQR bounds ke bahar
+    }
+
+    def __init__(self, known_states=None):
+        self.known_states = set(known_states) if known_states else None
+        self.processed_path = "processed_data"
+        self.quarantine_path = f"{self.processed_path}/quarantine"
+        self.summary_file = f"{self.processed_path}/dq_summary.csv"
+
+        # Quarantine rows Parquet mein (CSV text formatting split ka sabse mehenga step tha)
+        try:
+            import pyarrow  # noqa: F401
+            self.rows_format = 'parquet'
+        except ImportError:
+            self.rows_format = 'csv'
+
+        os.makedirs(self.quarantine_path, exist_ok=True)
+
+    def quarantine_files(self, source):
+        """Ek source ki (quarantine rows, summary) files - har source alag, overwrite nahi"""
+        stem = os.path.splitext(os.path.basename(str(source)))[0]
+        return (f"{self.quarantine_path}/{stem}_rows.{self.rows_format}",
+                f"{self.quarantine_path}/{stem}_summary.csv")
+
+    def load_quarantine(self, source):
+        """Ek source ki quarantined rows wapas padho (review/re-processing ke liye)"""
+        rows_file, _ = self.quarantine_files(source)
+        if not os.path.exists(rows_file):
+            return None
+        if self.rows_format == 'parquet':
+            return pd.read_parquet(rows_file)
+        return pd.read_csv(rows_file)
+
+    @staticmethod
+    def _column(df, col, dtype, fill):
+        """
+        Column ka numpy array; pehle se sahi type ho to copy nahi banti
+        (datetime kisi bhi unit - ns/us - mein chalega, comparisons unit-safe hain)
+        """
+        dtype = np.dtype(dtype)
+        if col not in df:
+            return np.full(len(df), fill, dtype=dtype)
+        values = df[col].to_numpy()
+        if values.dtype == dtype or (dtype.kind == 'M' and values.dtype.kind == 'M'):
+            return values
+        return df[col].to_numpy(dtype=dtype)
+
+    @staticmethod
+    def _isin_categories(series, allowed):
+        """isin sirf unique values par, phir codes se poore column par (ek gather)"""
+        cat = series.astype('category')
+        # Aakhri slot NaN (code -1) ke liye: missing value allowed nahi
+        ok_categories = np.append(cat.cat.categories.isin(list(allowed)), False)
+        return ok_categories[cat.cat.codes.to_numpy()]
+
+    def validate(self, df):
+        """
+        Saare rules ek pass mein evaluate karo, per-row bitmask return karo
+        """
+        modal = self._column(df, 'modal_price', np.float64, np.nan)
+        low = self._column(df, 'min_price', np.float64, np.nan)
+        high = self._column(df, 'max_price', np.float64, np.nan)
+        dates = self._column(df, 'date', 'datetime64[ns]', np.datetime64('NaT'))
+
+        missing = np.isnan(modal)
+        for col in ['commodity', 'market', 'price']:
+            if col in df:
+                missing |= df[col].isna().to_numpy()
+
+        # NaN comparisons False dete hain, isliye missing prices in rules ko trip nahi karte
+        with np.errstate(invalid='ignore'):
+            checks = {
+                'missing_required': missing,
+                'invalid_date': np.isnat(dates),
+                'future_date': dates > np.datetime64(datetime.now()),
+                'non_positive_price': (modal <= 0) | (low <= 0) | (high <= 0),
+                'min_gt_modal': low > modal,
+                'modal_gt_max': modal > high,
+            }
+
+            if self.known_states is not None and 'state' in df:
+                checks['unknown_state'] = ~self._isin_categories(df['state'], self.known_states)
+
+            q1, q3 = np.nanquantile(modal, [0.25, 0.75]) if (~missing).any() else (np.nan, np.nan)
+            iqr = q3 - q1
+            if iqr > 0:
+                checks['price_outlier'] = (modal < q1 - 1.5 * iqr) | (modal > q3 + 1.5 * iqr)
+
+        # Abhi saare bits uint8 mein fit hote hain: bool arrays ko bina copy OR karo,
+        # uint32 mein sirf aakhir mein ek baar convert
+        if max(self.RULES.values()) < 8:
+            mask = np.zeros(len(df), dtype=np.uint8)
+            for rule, failed in checks.items():
+                mask |= failed.view(np.uint8) << np.uint8(self.RULES[rule])
+            return mask.astype(np.uint32)
+
+        mask = np.zeros(len(df), dtype=np.uint32)
+        for rule, failed in checks.items():
+            mask |= failed.astype(np.uint32) << np.uint32(self.RULES[rule])
+        return mask
+
+    def describe(self, mask):
+        """
+        Bitmask ko rule names mein decode karo (sirf unique mask values par)
+        """
+        values, inverse = np.unique(mask, return_inverse=True)
+        labels = np.array(['|'.join(r for r, bit in self.RULES.items() if v >> bit & 1)
+                           for v in values], dtype=object)
+        return labels[inverse]
+
+    def summarize(self, quarantined, mask, source):
+        """
+        Rule x commodity failure counts (long format), sirf quarantined rows par
+        """
+        commodity = quarantined['commodity'].astype(object).fillna('(missing)').to_numpy() \
+            if 'commodity' in quarantined else np.full(len(quarantined), '(missing)', dtype=object)
+        frames = []
+        for rule, bit in self.RULES.items():
+            failed = (mask >> np.uint32(bit) & 1).astype(bool)
+            if not failed.any():
+                continue
+            counts = pd.Series(commodity[failed]).value_counts()
+            frames.append(pd.DataFrame({
+                'rule': rule, 'source': source,
+                'commodity': counts.index, 'failed_rows': counts.to_numpy()
+            }))
+        return pd.concat(frames, ignore_index=True)
+
+    @staticmethod
+    def _drop_unused_categories(df):
+        """
+        Jo categories sirf quarantined rows mein thi unhe hatao
+        (bincount + code remap; remove_unused_categories ka np.unique sort nahi)
+        """
+        df = df.copy(deep=False)
+        for col in df.columns:
+            if not isinstance(df[col].dtype, pd.CategoricalDtype):
+                continue
+            cat = df[col].array
+            codes = np.asarray(cat.codes)
+            used = np.bincount(codes[codes >= 0], minlength=len(cat.categories)) > 0
+            if used.all():
+                continue
+            # Aakhri slot NaN (code -1) ke liye
+            remap = np.append(np.cumsum(used) - 1, -1).astype(codes.dtype)
+            df[col] = pd.Categorical.from_codes(remap[codes], categories=cat.categories[used],
+                                                ordered=cat.ordered)
+        return df
+
+    def _write_summary(self):
+        """Saare sources ki per-source summaries se combined dq_summary.csv"""
+        frames = [pd.read_csv(path) for path in sorted(glob.glob(f"{self.quarantine_path}/*_summary.csv"))]
+        if frames:
+            pd.concat(frames, ignore_index=True).to_csv(self.summary_file, index=False)
+        elif os.path.exists(self.summary_file):
+            os.remove(self.summary_file)
+
+    def split(self, df, source):
+        """
+        Validate karo, failing rows quarantine karo, aur (clean rows, mask) return karo.
+        Clean rows mein quarantined-only categories nahi rehti
+        """
+        mask = self.validate(df)
+        failed = mask != 0
+        rows_file, source_summary_file = self.quarantine_files(source)
+
+        if failed.any():
+            failed_mask = mask[failed]
+            quarantined = df[failed].copy()
+            quarantined['dq_mask'] = failed_mask
+            quarantined['dq_failures'] = self.describe(failed_mask)
+            quarantined['source'] = source
+            if self.rows_format == 'parquet':
+                quarantined.to_parquet(rows_file, index=False)
+            else:
+                quarantined.to_csv(rows_file, index=False)
+
+            summary = self.summarize(quarantined, failed_mask, source)
+            summary.to_csv(source_summary_file, index=False)
+            self._write_summary()
+
+            print(f"🚧 Quarantined {len(quarantined)} rows: {rows_file}")
+            by_rule = summary.groupby('rule', sort=False)['failed_rows'].sum()
+            for rule, count in by_rule.items():
+                print(f"   {rule}: {count}")
+            return self._drop_unused_categories(df[~failed]), mask
+
+        # Is source ki pichhle run ki quarantine files stale na rahein
+        for path in [rows_file, source_summary_file]:
+            if os.path.exists(path):
+                os.remove(path)
+        self._write_summary()
+        print("✅ All rows passed data-quality checks")
+        return df, mask
@@ -0,0 +1,222 @@
+import pandas as pd
+import numpy as np
+import difflib
+import argparse
+import json
+import os
+
+
+class EntityNormalizer:
+    """
+    Commodity/state/market names ko canonical form mein laao.
+    Saara kaam column ki unique values (categorical categories) par hota hai,
+    phir poore column ke codes ek vectorized step mein remap hote hain -
+    cost distinct names se scale karta hai, rows se nahi.
+    """
+
+    # Existing cleaning ki tarah commodity/state title-case, market as-is
+    ENTITIES = {'commodity': True, 'state': True, 'market': False}
+    # State canonical list haath se curate hoti hai; baaki data se seed ho sakti hain
+    SEEDABLE = ['commodity', 'market']
+
+    def __init__(self, alias_file="data/entity_aliases.json"):
+        self.alias_file = alias_file
+        self.processed_path = "processed_data"
+        self.suggestions_file = f"{self.processed_path}/alias_suggestions.csv"
+
+        os.makedirs(self.processed_path, exist_ok=True)
+        self.load_aliases()
+
+    def load_aliases(self):
+        """
+        Versioned alias table load karo
+        """
+        if os.path.exists(self.alias_file):
+            with open(self.alias_file, encoding='utf-8') as f:
+                self.table = json.load(f)
+        else:
+            self.table = {'version': 0}
+
+        self.version = self.table.get('version', 0)
+        self.alias_maps = {}
+        self.canonical = {}
+        for entity in self.ENTITIES:
+            spec = self.table.setdefault(entity, {'aliases': {}, 'canonical': []})
+            canonical = list(spec.get('canonical', [])) + list(spec.get('aliases', {}).values())
+            self.canonical[entity] = sorted(set(canonical))
+
+            # Lookup key casefold form par; canonical names khud par map hote hain
+            lookup = {self._key(name): name for name in self.canonical[entity]}
+            lookup.update({self._key(alias): target
+                           for alias, target in spec.get('aliases', {}).items()})
+            self.alias_maps[entity] = lookup
+        return self.table
+
+    def add_alias(self, entity, alias, canonical):
+        self.table[entity]['aliases'][alias] = canonical
+
+    def save_aliases(self):
+        """
+        Alias table save karo (har save par version bump hota hai)
+        """
+        self.table['version'] = self.version + 1
+        with open(self.alias_file, 'w', encoding='utf-8') as f:
+            json.dump(self.table, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        self.load_aliases()
+        print(f"💾 Alias table saved: {self.alias_file} (version {self.version})")
+
+    @staticmethod
+    def _key(name):
+        return EntityNormalizer._display(pd.Index([name]), title=False).str.casefold()[0]
+
+    @staticmethod
+    def _display(names, title):
+        """Whitespace aur brackets ki spacing ek jaisi karo: 'Pune(Moshi )' -> 'Pune (Moshi)'"""
+        s = pd.Index(names).astype(str)
+        s = s.str.replace(r'\s+', ' ', regex=True).str.strip()
+        s = s.str.replace(r'\s*\(\s*', ' (', regex=True).str.replace(r'\s*\)', ')', regex=True)
+        s = s.str.strip()
+        if title:
+            s = s.str.title()
+        return s
+
+    def map_names(self, names, entity):
+        """
+        Unique names ko canonical names par map karo.
+        Returns (mapped names, unseen names jo alias table mein nahi mile)
+        """
+        display = self._display(names, title=self.ENTITIES[entity])
+        keys = display.str.casefold()
+        lookup = self.alias_maps[entity]
+
+        mapped = np.array([lookup.get(k, d) for k, d in zip(keys, display)], dtype=object)
+        unseen = [d for k, d in zip(keys, display) if k not in lookup]
+        return mapped, unseen
+
+    def suggest(self, unseen, entity, candidates=None):
+        """
+        Unseen names ke liye fuzzy-match suggestions, sirf canonical/alias-target names
+        (ya diye gaye candidates) ke against (auto-apply nahi hote, review ke liye).
+        Unseen names aapas mein match nahi hote, warna 'Mannargudi I' <-> 'Mannargudi II'
+        jaise ulte-seedhe pairs bante hain.
+        """
+        if candidates is None:
+            candidates = self.canonical[entity]
+        if not candidates:
+            return []
+
+        # Brackets wala qualifier (jaise '(Uzhavar Sandhai)') bahut names mein common hai,
+        # isliye similarity sirf base name par naapo
+        base = lambda name: name.split(' (')[0].casefold()
+        by_base = {}
+        for c in candidates:
+            by_base.setdefault(base(c), c)
+
+        rows = []
+        seen_pairs = set()
+        for name in unseen:
+            pool = [b for b in by_base if b != base(name)]
+            matches = difflib.get_close_matches(base(name), pool, n=1, cutoff=0.8)
+            if matches and (name, by_base[matches[0]]) not in seen_pairs:
+                seen_pairs.add((name, by_base[matches[0]]))
+                score = difflib.SequenceMatcher(None, base(name), matches[0]).ratio()
+                rows.append({'entity': entity, 'name': name,
+                             'suggestion': by_base[matches[0]], 'score': round(score, 3)})
+        return rows
+
+    def seed_canonical(self, df):
+        """
+        Current data ke normalized commodity/market names canonical list mein daalo,
+        taaki 'not in alias table' sirf sach mein naye names gine. Names zyada rows
+        wale pehle aate hain; jis name ka kisi canonical se close match (suggest())
+        mile wo seed nahi hota - spelling variant ('Duster Beans' vs 'Cluster Beans')
+        canonical ban gaya to kabhi merge nahi hoga. Aise names review ke liye
+        alias_suggestions.csv mein jaate hain. Alias table save hoti hai.
+        """
+        normalized = self.normalize(df, suggest=False)
+        held = []
+        for entity in self.SEEDABLE:
+            if entity not in normalized.columns:
+                continue
+            spec = self.table[entity]
+            counts = normalized[entity].dropna().astype(str).value_counts()
+            # Barabar count par name order se, taaki seed deterministic rahe
+            names = sorted(counts.index, key=lambda name: (-counts[name], name))
+
+            accepted = list(self.canonical[entity])
+            known = set(accepted)
+            added = []
+            for name in names:
+                if name in known:
+                    continue
+                rows = self.suggest([name], entity, candidates=accepted)
+                if rows:
+                    held.extend(rows)
+                    continue
+                accepted.append(name)
+                known.add(name)
+                added.append(name)
+
+            spec['canonical'] = sorted(set(spec['canonical']) | set(added))
+            n_held = sum(1 for r in held if r['entity'] == entity)
+            print(f"   {entity}: {len(added)} names added to canonical list, "
+                  f"{n_held} held back as likely variants")
+
+        if held:
+            pd.DataFrame(held).to_csv(self.suggestions_file, index=False)
+            print(f"💡 {len(held)} alias suggestions saved: {self.suggestions_file}")
+        self.save_aliases()
+
+    def normalize_column(self, series, entity):
+        """
+        Ek column normalize karo: categories map karo, phir codes ek saath remap
+        """
+        cat = series.astype('category')
+        categories = cat.cat.categories
+
+        mapped, unseen = self.map_names(categories, entity)
+        remap, new_categories = pd.factorize(mapped)
+
+        codes = cat.cat.codes.to_numpy()
+        new_codes = np.where(codes >= 0, remap[codes], -1)
+        normalized = pd.Series(
+            pd.Categorical.from_codes(new_codes, categories=pd.Index(new_categories, dtype=object)),
+            index=series.index, name=series.name
+        )
+        return normalized, unseen, list(new_categories), len(categories)
+
+    def normalize(self, df, suggest=True):
+        """
+        DataFrame ke entity columns normalize karo aur unseen names ke suggestions save karo
+        """
+        print(f"\n🏷️  Normalizing entity names (alias table v{self.version})...")
+        df = df.copy(deep=False)
+        suggestions = []
+        for entity in self.ENTITIES:
+            if entity not in df.columns:
+                continue
+            df[entity], unseen, known, before = self.normalize_column(df[entity], entity)
+            print(f"   {entity}: {before} -> {len(known)} distinct names ({len(unseen)} not in alias table)")
+            if suggest and unseen:
+                suggestions.extend(self.suggest(unseen, entity))
+
+        if suggestions:
+            pd.DataFrame(suggestions).to_csv(self.suggestions_file, index=False)
+            print(f"💡 {len(suggestions)} alias suggestions saved: {self.suggestions_file}")
+        return df
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AgriSense entity name normalization")
+    parser.add_argument('file', nargs='?', default="data/crop_data.csv")
+    parser.add_argument('--seed', action='store_true',
+                        help="file ke commodity/market names canonical list mein daalo (alias table version bump)")
+    args = parser.parse_args()
+
+    raw_df = pd.read_csv(args.file)
+    normalizer = EntityNormalizer()
+    if args.seed:
+        normalizer.seed_canonical(raw_df)
+    normalized_df = normalizer.normalize(raw_df)
+    print(normalized_df[['commodity', 'state', 'market']].head())
@@ -0,0 +1,404 @@
+import pandas as pd
+import numpy as np
+import argparse
+import os
+
+
+class FeatureStateStore:
+    """
+    Har (commodity, state, market) series ke liye online feature state.
+    Ek nayi arrival par features O(1) mein update hote hain, poori
+    history par create_features dobara chalane ki zarurat nahi.
+
+    State struct-of-arrays hai (har series ek row), isliye checkpoint
+    ek compact .npz file hai. ingest() checkpoint load -> update -> predict
+    karta hai aur har flush_every arrivals par save; flush() baaki pending
+    arrivals save karta hai. Snapshot (online_features.csv) dashboard padhta hai.
+    """
+
+    WINDOW_SHORT = 7
+    WINDOW_LONG = 30
+
+    def __init__(self, series_keys=('commodity', 'state', 'market'), flush_every=1000,
+                 detector=None):
+        self.series_keys = list(series_keys)
+        # Optional PriceSpikeDetector: har arrival usse bhi guzarti hai, state saath save hota hai
+        self.detector = detector
+        # Checkpoint + snapshot har arrival par nahi, har flush_every arrivals par (ya flush())
+        self.flush_every = flush_every
+        self.pending = 0
+        self.processed_path = "processed_data"
+        self.checkpoint_file = f"{self.processed_path}/feature_state.npz"
+        self.snapshot_file = f"{self.processed_path}/online_features.csv"
+
+        os.makedirs(self.processed_path, exist_ok=True)
+        self._reset(capacity=1024)
+
+    def _reset(self, capacity):
+        self.index = {}
+        self.keys = []
+        self.size = 0
+        self.buffer = np.zeros((capacity, self.WINDOW_LONG))
+        self.count = np.zeros(capacity, dtype=np.int64)
+        self.pos = np.zeros(capacity, dtype=np.int64)
+        # Running sums shifted by series ke pehle price se (variance stable rahe)
+        self.shift = np.zeros(capacity)
+        self.sum_short = np.zeros(capacity)
+        self.sum_long = np.zeros(capacity)
+        self.sumsq_long = np.zeros(capacity)
+        self.last_price = np.full(capacity, np.nan)
+        self.last_date = np.full(capacity, np.datetime64('NaT'), dtype='datetime64[ns]')
+        self.predicted_price = np.full(capacity, np.nan)
+
+    def _grow(self):
+        capacity = len(self.count) * 2
+        for name in ['buffer', 'count', 'pos', 'shift', 'sum_short', 'sum_long',
+                     'sumsq_long', 'last_price', 'last_date', 'predicted_price']:
+            old = getattr(self, name)
+            fill = np.nan if name in ('last_price', 'predicted_price') else 0
+            if name == 'last_date':
+                fill = np.datetime64('NaT')
+            new = np.full((capacity,) + old.shape[1:], fill, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def _series_id(self, key):
+        sid = self.index.get(key)
+        if sid is None:
+            if self.size == len(self.count):
+                self._grow()
+            sid = self.size
+            self.index[key] = sid
+            self.keys.append(key)
+            self.size += 1
+        return sid
+
+    def _features(self, sid, price, date):
+        n = self.count[sid]
+        n_short = min(n, self.WINDOW_SHORT)
+        n_long = min(n, self.WINDOW_LONG)
+        k = self.shift[sid]
+
+        avg_7 = float(k + self.sum_short[sid] / n_short)
+        avg_30 = float(k + self.sum_long[sid] / n_long)
+        if n_long > 1:
+            mean_shifted = self.sum_long[sid] / n_long
+            var = (self.sumsq_long[sid] - n_long * mean_shifted ** 2) / (n_long - 1)
+            volatility = float(np.sqrt(max(var, 0.0)))
+        else:
+            volatility = 0.0
+
+        prev = self.last_price[sid] if n > 1 else np.nan
+        change_pct = float((price - prev) / prev * 100) if n > 1 else 0.0
+
+        features = {
+            'modal_price': price,
+            'price_7day_avg': avg_7,
+            'price_30day_avg': avg_30,
+            'price_change_pct': change_pct,
+            'volatility': volatility,
+            'price_vs_7day_avg': (price - avg_7) / avg_7 * 100 if avg_7 else 0.0,
+            'price_vs_30day_avg': (price - avg_30) / avg_30 * 100 if avg_30 else 0.0,
+            'trend': 'Rising' if change_pct > 2 else ('Falling' if change_pct < -2 else 'Stable'),
+        }
+        if date is not None and not pd.isna(date):
+            date = pd.Timestamp(date)
+            features.update({
+                'date': date,
+                'month': date.month,
+                'quarter': date.quarter,
+                'day_of_year': date.dayofyear,
+                'week_of_year': date.isocalendar()[1],
+            })
+        return features
+
+    def update(self, record):
+        """
+        Ek nayi arrival ingest karo aur uske updated features return karo
+        """
+        key = tuple(record[c] for c in self.series_keys)
+        price = float(record['modal_price'])
+        date = record.get('date')
+
+        sid = self._series_id(key)
+        n = self.count[sid]
+        if n == 0:
+            self.shift[sid] = price
+        x = price - self.shift[sid]
+
+        # 7-window: ring buffer mein 7 position peeche wala value nikalo
+        if n >= self.WINDOW_SHORT:
+            out_short = self.buffer[sid, (self.pos[sid] - self.WINDOW_SHORT) % self.WINDOW_LONG]
+            self.sum_short[sid] -= out_short
+        if n >= self.WINDOW_LONG:
+            out_long = self.buffer[sid, self.pos[sid]]
+            self.sum_long[sid] -= out_long
+            self.sumsq_long[sid] -= out_long ** 2
+
+        self.buffer[sid, self.pos[sid]] = x
+        self.pos[sid] = (self.pos[sid] + 1) % self.WINDOW_LONG
+        self.sum_short[sid] += x
+        self.sum_long[sid] += x
+        self.sumsq_long[sid] += x ** 2
+        self.count[sid] = n + 1
+
+        # last_price abhi pichla price hai, isliye price_change_pct sahi banta hai
+        features = self._features(sid, price, date)
+        self.last_price[sid] = price
+        if date is not None and not pd.isna(date):
+            self.last_date[sid] = np.datetime64(pd.Timestamp(date), 'ns')
+
+        features.update(dict(zip(self.series_keys, key)))
+        return features
+
+    def rebuild(self, df):
+        """
+        History se poora state dobara banao (vectorized, per-row loop nahi)
+        """
+        print(f"\n🔁 Rebuilding feature state from {len(df)} rows...")
+        df = df.dropna(subset=self.series_keys + ['modal_price'])
+        df = df.sort_values(self.series_keys + ['date'], kind='mergesort')
+
+        grouped = df.groupby(self.series_keys, sort=False)
+        codes = grouped.ngroup().to_numpy()
+        seq = grouped.cumcount().to_numpy()
+        prices = df['modal_price'].to_numpy(dtype=float)
+
+        sizes = np.bincount(codes)
+        n_series = len(sizes)
+        self._reset(capacity=max(n_series, 1))
+
+        first_idx = np.flatnonzero(seq == 0)
+        last_idx = np.flatnonzero(seq == sizes[codes] - 1)
+        self.keys = [tuple(row) for row in df.iloc[first_idx][self.series_keys].to_numpy()]
+        self.index = {key: i for i, key in enumerate(self.keys)}
+        self.size = n_series
+
+        self.shift[:n_series] = prices[first_idx]
+        self.count[:n_series] = sizes
+        self.pos[:n_series] = sizes % self.WINDOW_LONG
+        self.last_price[:n_series] = prices[last_idx]
+        if 'date' in df.columns:
+            self.last_date[:n_series] = pd.to_datetime(df['date']).to_numpy()[last_idx]
+
+        # Sirf har series ki aakhri 30 rows buffer mein jaati hain
+        tail = seq >= sizes[codes] - self.WINDOW_LONG
+        x = prices[tail] - self.shift[codes[tail]]
+        self.buffer[codes[tail], seq[tail] % self.WINDOW_LONG] = x
+        np.add.at(self.sum_long, codes[tail], x)
+        np.add.at(self.sumsq_long, codes[tail], x ** 2)
+
+        short = seq >= sizes[codes] - self.WINDOW_SHORT
+        np.add.at(self.sum_short, codes[short], prices[short] - self.shift[codes[short]])
+
+        print(f"✅ Feature state rebuilt: {n_series} series")
+        return self
+
+    def latest_features(self):
+        """
+        Har series ke current features ek DataFrame mein (predictor/dashboard ke liye).
+        State arrays par vectorized - per-series _features() loop nahi
+        """
+        n = self.size
+        count = self.count[:n]
+        k = self.shift[:n]
+        n_short = np.maximum(np.minimum(count, self.WINDOW_SHORT), 1)
+        n_long = np.maximum(np.minimum(count, self.WINDOW_LONG), 1)
+
+        price = self.last_price[:n]
+        avg_7 = k + self.sum_short[:n] / n_short
+        avg_30 = k + self.sum_long[:n] / n_long
+        mean_shifted = self.sum_long[:n] / n_long
+        var = (self.sumsq_long[:n] - n_long * mean_shifted ** 2) / np.maximum(n_long - 1, 1)
+        volatility = np.where(n_long > 1, np.sqrt(np.maximum(var, 0.0)), 0.0)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            vs_7 = np.where(avg_7 != 0, (price - avg_7) / avg_7 * 100, 0.0)
+            vs_30 = np.where(avg_30 != 0, (price - avg_30) / avg_30 * 100, 0.0)
+
+        dates = pd.DatetimeIndex(self.last_date[:n])
+        out = pd.DataFrame({
+            'modal_price': price,
+            'price_7day_avg': avg_7,
+            'price_30day_avg': avg_30,
+            'volatility': volatility,
+            'price_vs_7day_avg': vs_7,
+            'price_vs_30day_avg': vs_30,
+            'date': dates,
+            'month': dates.month,
+            'quarter': dates.quarter,
+            'day_of_year': dates.dayofyear,
+            'week_of_year': dates.isocalendar().week.to_numpy(dtype=float, na_value=np.nan),
+            'predicted_price': self.predicted_price[:n],
+        })
+        keys = pd.DataFrame(self.keys, columns=self.series_keys)
+        for col in self.series_keys:
+            out[col] = keys[col].to_numpy()
+        return out
+
+    def save(self):
+        """
+        State ko compact .npz checkpoint mein save karo
+        """
+        try:
+            n = self.size
+            key_array = np.array(self.keys, dtype=str).reshape(n, len(self.series_keys))
+            np.savez_compressed(
+                self.checkpoint_file,
+                series_keys=np.array(self.series_keys),
+                keys=key_array,
+                buffer=self.buffer[:n],
+                count=self.count[:n],
+                pos=self.pos[:n],
+                shift=self.shift[:n],
+                sum_short=self.sum_short[:n],
+                sum_long=self.sum_long[:n],
+                sumsq_long=self.sumsq_long[:n],
+                last_price=self.last_price[:n],
+                last_date=self.last_date[:n],
+                predicted_price=self.predicted_price[:n],
+            )
+            self.latest_features().to_csv(self.snapshot_file, index=False)
+            if self.detector is not None:
+                self.detector.save()
+            self.pending = 0
+            print(f"💾 Feature state saved: {self.checkpoint_file} ({n} series)")
+            return True
+        except Exception as e:
+            print(f"❌ Error saving feature state: {e}")
+            return False
+
+    def load(self):
+        """
+        Checkpoint se state wapas load karo
+        """
+        try:
+            data = np.load(self.checkpoint_file)
+            self.series_keys = data['series_keys'].tolist()
+            n = len(data['count'])
+            self._reset(capacity=max(n, 1))
+            self.keys = [tuple(row) for row in data['keys'].tolist()]
+            self.index = {key: i for i, key in enumerate(self.keys)}
+            self.size = n
+            for name in ['buffer', 'count', 'pos', 'shift', 'sum_short', 'sum_long',
+                         'sumsq_long', 'last_price', 'last_date', 'predicted_price']:
+                # Purane checkpoints mein predicted_price nahi hota
+                if name in data:
+                    getattr(self, name)[:n] = data[name]
+            print(f"✅ Feature state loaded: {n} series")
+            return self
+        except Exception as e:
+            print(f"❌ Error loading feature state: {e}")
+            return None
+
+    def ingest(self, records, predictor=None):
+        """
+        Nayi arrivals ka online path: checkpoint load karo, har record update karo,
+        updated features seedha predictor ko do aur record detector ko. Checkpoint + snapshot har
+        flush_every arrivals par likhe jaate hain (poora state har arrival par nahi);
+        batch ke end par flush() call karo.
+        Returns har record ke features (predicted_price ke saath)
+        """
+        if self.size == 0 and os.path.exists(self.checkpoint_file):
+            self.load()
+        detector = self.detector
+        if detector is not None and not detector.keys and os.path.exists(detector.state_file):
+            detector.load()
+
+        results = []
+        for record in records:
+            features = self.update(record)
+            if predictor is not None:
+                try:
+                    features['predicted_price'] = float(predictor.predict_from_features(features))
+                except Exception as e:
+                    print(f"⚠️  Prediction skipped: {e}")
+                    predictor = None
+            # Bina predictor ke purana prediction stale ho jaata, isliye NaN
+            sid = self.index[tuple(record[c] for c in self.series_keys)]
+            self.predicted_price[sid] = features.get('predicted_price', np.nan)
+            if detector is not None:
+                features['spike_alert'] = detector.process(record) is not None
+            results.append(features)
+
+            self.pending += 1
+            if self.pending >= self.flush_every:
+                self.save()
+
+        print(f"📥 Ingested {len(results)} arrivals")
+        return results
+
+    def flush(self):
+        """
+        Pending arrivals ho to checkpoint + snapshot save karo
+        """
+        if self.pending == 0:
+            return True
+        return self.save()
+
+    def verify_against_batch(self, df, batch_df):
+        """
+        Rows ko ek-ek karke ek fresh store mein stream karo aur batch create_features
+        se compare karo (is store ka state nahi chhoda jaata).
+        batch_df same series_keys grouping ke saath bana hona chahiye.
+        """
+        cols = ['price_7day_avg', 'price_30day_avg', 'price_change_pct', 'volatility']
+        fresh = FeatureStateStore(self.series_keys)
+        ordered = df.sort_values(self.series_keys + ['date'], kind='mergesort')
+        batch = batch_df.loc[ordered.index, cols]
+
+        streamed = [fresh.update(record) for record in ordered.to_dict('records')]
+        streamed = pd.DataFrame(streamed, index=ordered.index)[cols]
+
+        max_diff = (streamed - batch).abs().max()
+        ok = np.allclose(streamed.to_numpy(dtype=float), batch.to_numpy(dtype=float),
+                         rtol=1e-6, atol=1e-6)
+        print(f"{'✅' if ok else '❌'} Online vs batch features match: {ok}")
+        for col, diff in max_diff.items():
+            print(f"   {col}: max abs diff {diff:.2e}")
+        return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AgriSense online feature store")
+    sub = parser.add_subparsers(dest='command')
+    sub.add_parser('rebuild', help="clean data se state rebuild + batch verify (default)")
+    ingest_parser = sub.add_parser('ingest', help="ek nayi arrival ingest karo aur predict karo")
+    ingest_parser.add_argument('--commodity', required=True)
+    ingest_parser.add_argument('--state', required=True)
+    ingest_parser.add_argument('--market', required=True)
+    ingest_parser.add_argument('--date', required=True)
+    ingest_parser.add_argument('--price', type=float, required=True)
+    args = parser.parse_args()
+
+    if args.command == 'ingest':
+        from ml_models import PricePredictor
+        from price_alerts import (JsonlAlertSink, PriceSpikeDetector, SqliteAlertSink,
+                                  STAPLE_COMMODITIES)
+
+        detector = PriceSpikeDetector(sinks=[JsonlAlertSink(), SqliteAlertSink()],
+                                      commodities=STAPLE_COMMODITIES)
+        store = FeatureStateStore(detector=detector)
+        record = {'commodity': args.commodity, 'state': args.state, 'market': args.market,
+                  'date': pd.Timestamp(args.date), 'modal_price': args.price}
+        features = store.ingest([record], predictor=PricePredictor())[0]
+        store.flush()
+        print(f"   7-day avg: ₹{features['price_7day_avg']:.2f}, "
+              f"30-day avg: ₹{features['price_30day_avg']:.2f}, "
+              f"predicted: ₹{features.get('predicted_price', np.nan):.2f}")
+        if features.get('spike_alert'):
+            print("🚨 Price spike alert raised (processed_data/alerts.jsonl)")
+    else:
+        from data_pipeline import AgriSenseDataManager
+
+        store = FeatureStateStore()
+        clean_df = pd.read_csv("processed_data/clean_commodity_prices.csv")
+        clean_df['date'] = pd.to_datetime(clean_df['date'], errors='coerce')
+        clean_df = clean_df.dropna(subset=['date'])
+
+        manager = AgriSenseDataManager()
+        batch_df = manager.create_features(clean_df, group_cols=store.series_keys, save=False)
+        store.verify_against_batch(clean_df, batch_df)
+
+        store.rebuild(clean_df)
+        store.save()
@@ -0,0 +1,103 @@
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+# Repo root se chalao: python scripts/measure_dashboard_rss.py
+# (Linux only - /proc se RSS/PSS padhta hai; gunicorn installed hona chahiye)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def child_pids(pid):
+    """Gunicorn master ke worker processes"""
+    pids = []
+    for task in os.listdir(f"/proc/{pid}/task"):
+        try:
+            with open(f"/proc/{pid}/task/{task}/children") as f:
+                pids.extend(int(p) for p in f.read().split())
+        except FileNotFoundError:
+            continue
+    return pids
+
+
+def memory_kb(pid):
+    """
+    (RSS, PSS) in kB. PSS shared pages ko processes mein baant deta hai,
+    isliye memory-mapped file ka asli share isi se dikhta hai.
+    """
+    rss = pss = 0
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            if line.startswith('Rss:'):
+                rss = int(line.split()[1])
+            elif line.startswith('Pss:'):
+                pss = int(line.split()[1])
+    return rss, pss
+
+
+def wait_until_ready(url, pids, timeout=120):
+    """
+    Har worker ke /health par 200 dene tak poll karo. Data background thread mein
+    load hota hai, isliye '/' ya 503 (loading) ka matlab dataset memory mein aa gaya nahi hai;
+    /health sirf jawab dene wale worker (pid) ka status batata hai
+    """
+    start = time.perf_counter()
+    ready_pids = set()
+    while time.perf_counter() - start < timeout:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                ready_pids.add(json.loads(response.read())['pid'])
+            if set(pids) <= ready_pids:
+                return time.perf_counter() - start
+            time.sleep(0.01)
+        except (urllib.error.URLError, OSError, ValueError, KeyError):
+            time.sleep(0.05)
+    return None
+
+
+def measure(workers, mode, port):
+    env = dict(os.environ, AGRISENSE_DATA_MODE=mode)
+    proc = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-w', str(workers),
+         '-b', f'127.0.0.1:{port}', 'dashboard.app:server'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        # Saare workers boot ho jaayein
+        deadline = time.time() + 60
+        while len(child_pids(proc.pid)) < workers and time.time() < deadline:
+            time.sleep(0.1)
+
+        ready = wait_until_ready(f'http://127.0.0.1:{port}/health', child_pids(proc.pid))
+
+        pids = child_pids(proc.pid)
+        totals = [memory_kb(p) for p in pids]
+        rss = sum(t[0] for t in totals) / 1024
+        pss = sum(t[1] for t in totals) / 1024
+        return ready, len(pids), rss, pss
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        proc.wait(timeout=30)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dashboard worker memory: CSV vs memory-mapped Arrow")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 8])
+    parser.add_argument('--modes', nargs='+', default=['csv', 'mmap'])
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    print("📏 AgriSense Dashboard Memory Benchmark\n")
+    print(f"{'mode':<6} {'workers':>7} {'ready (s)':>10} {'RSS total (MB)':>15} {'PSS total (MB)':>15} {'PSS/worker':>11}")
+    print("-" * 70)
+    for mode in args.modes:
+        for workers in args.workers:
+            ready, n, rss, pss = measure(workers, mode, args.port)
+            ready_str = f"{ready:.2f}" if ready is not None else "timeout"
+            print(f"{mode:<6} {n:>7} {ready_str:>10} {rss:>15.1f} {pss:>15.1f} {pss / max(n, 1):>11.1f}")
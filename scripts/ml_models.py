@@ -1,10 +1,10 @@
 import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestRegressor
-from xgboost import XGBRegressor  # type: ignore
 import pickle
 import numpy as np
 
+# sklearn/xgboost sirf training ke time import hote hain (prediction-only startup fast rahe);
+# prediction mein xgboost tabhi load hota hai jab pickle.load model unpickle karta hai
+
 class PricePredictor:
     def __init__(self):
         self.model = None
@@ -15,16 +15,27 @@ class PricePredictor:
         """
         Commodity price prediction model train karo
         """
+        from sklearn.model_selection import train_test_split
+        from xgboost import XGBRegressor  # type: ignore
+        
         # Featured data load karo
         df = pd.read_csv(f"{self.processed_path}/featured_data.csv")
         
         # Features select karo
         feature_cols = ['price_7day_avg', 'price_30day_avg', 
                         'month', 'quarter', 'volatility']
+        base_cols = feature_cols
+        
+        # Weather features (WeatherJoiner se) available hon to add karo
+        weather_cols = ['temperature', 'humidity', 'rainfall_3day',
+                        'rainfall_7day', 'temp_7day_mean']
+        if all(c in df.columns and df[c].notna().any() for c in weather_cols):
+            feature_cols = feature_cols + weather_cols
         target_col = 'modal_price'
         
-        # Prepare data
-        df = df.dropna(subset=feature_cols + [target_col])
+        # Prepare data (dropna sirf base features par - jin rows par weather match
+        # nahi hua wo training se nahi hatti, XGBoost weather NaN khud handle karta hai)
+        df = df.dropna(subset=base_cols + [target_col])
         X = df[feature_cols]
         y = df[target_col]
         
@@ -70,14 +81,37 @@ class PricePredictor:
         df = pd.read_csv(f"{self.processed_path}/featured_data.csv")
         df = df[df['commodity'] == commodity_name].tail(1)
         
-        # Features prepare karo
-        features = df[['price_7day_avg', 'price_30day_avg', 
-                       'month', 'quarter', 'volatility']]
+        # Features prepare karo (model jin columns par train hua wahi)
+        feature_cols = getattr(model, 'feature_names_in_', None)
+        if feature_cols is None:
+            feature_cols = ['price_7day_avg', 'price_30day_avg', 
+                            'month', 'quarter', 'volatility']
+        features = df[list(feature_cols)]
         
         # Prediction
         predicted_price = model.predict(features)[0]
         
         return predicted_price
+    
+    def predict_from_features(self, features):
+        """
+        FeatureStateStore.update() ke features se seedha predict karo
+        (featured_data.csv dobara padhne ki zarurat nahi)
+        """
+        if self.model is None:
+            with open(f"{self.model_path}/price_predictor.pkl", 'rb') as f:
+                self.model = pickle.load(f)
+        
+        feature_cols = getattr(self.model, 'feature_names_in_', None)
+        if feature_cols is None:
+            feature_cols = ['price_7day_avg', 'price_30day_avg', 
+                            'month', 'quarter', 'volatility']
+        # Online store mein weather features nahi hote; missing columns NaN
+        # (XGBoost NaN handle karta hai), KeyError se prediction band nahi hoti
+        row = pd.DataFrame([features]).reindex(columns=list(feature_cols))
+        row = row.apply(pd.to_numeric, errors='coerce')
+        
+        return self.model.predict(row)[0]
 
 # Run karo
 if __name__ == "__main__":
@@ -0,0 +1,362 @@
+import pandas as pd
+import numpy as np
+from datetime import datetime
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+import requests
+
+# Food-security ke liye sabse zaroori staples
+STAPLE_COMMODITIES = ['Onion', 'Tomato', 'Rice', 'Potato', 'Wheat']
+
+# Mean absolute deviation -> sigma (normal distribution ke liye sqrt(pi/2))
+MAD_TO_SIGMA = 1.2533
+
+
+class JsonlAlertSink:
+    """Alerts ko ek JSON-lines file mein append karo (pehle likhe alert_id dobara nahi, replay safe)"""
+
+    def __init__(self, path="processed_data/alerts.jsonl"):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.seen = set()
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        self.seen.add(json.loads(line)['alert_id'])
+                    except (ValueError, KeyError):
+                        continue
+
+    def emit(self, alerts):
+        new = [a for a in alerts if a['alert_id'] not in self.seen]
+        if not new:
+            return
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for alert in new:
+                f.write(json.dumps(alert, default=str) + "\n")
+                self.seen.add(alert['alert_id'])
+
+
+class SqliteAlertSink:
+    """Alerts SQLite table mein; alert_id primary key hai isliye replay par duplicate nahi banenge"""
+
+    def __init__(self, path="processed_data/alerts.db"):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with sqlite3.connect(self.path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS alerts (
+                    alert_id TEXT PRIMARY KEY,
+                    commodity TEXT, state TEXT, market TEXT,
+                    date TEXT, price REAL, expected_price REAL,
+                    robust_z REAL, change_pct REAL, created_at TEXT
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_alerts_date ON alerts(date)")
+
+    def emit(self, alerts):
+        cols = ['alert_id', 'commodity', 'state', 'market', 'date', 'price',
+                'expected_price', 'robust_z', 'change_pct', 'created_at']
+        rows = [tuple(str(a[c]) if c == 'date' else a[c] for c in cols) for a in alerts]
+        with sqlite3.connect(self.path) as conn:
+            conn.executemany(
+                f"INSERT OR IGNORE INTO alerts ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})",
+                rows
+            )
+
+
+class WebhookAlertSink:
+    """Webhook stub: url na ho to sirf print karo"""
+
+    def __init__(self, url=None, timeout=5):
+        self.url = url
+        self.timeout = timeout
+
+    def emit(self, alerts):
+        if not alerts:
+            return
+        if not self.url:
+            for alert in alerts:
+                print(f"🔔 [webhook stub] {alert['commodity']} @ {alert['market']}, "
+                      f"{alert['state']}: ₹{alert['price']:.2f} (z={alert['robust_z']:.1f})")
+            return
+        try:
+            payload = json.dumps({'alerts': alerts}, default=str)
+            requests.post(self.url, data=payload, timeout=self.timeout,
+                          headers={'Content-Type': 'application/json'})
+        except requests.exceptions.RequestException as e:
+            print(f"⚠️  Webhook error: {e}")
+
+
+class PriceSpikeDetector:
+    """
+    Streaming price-spike detector.
+    Har (commodity, state, market) series ke liye EWMA mean aur EWMA absolute
+    deviation rakhta hai; robust z-score threshold cross kare to alert.
+    Alert tabhi jab series ke min_obs observations ho chuke hon; min_obs warm-up
+    (1/alpha observations) se kam nahi ho sakta - kam observations par MAD chhota
+    aata hai aur z-score phool jaata hai (ValueError).
+    Cooldown event-time (arrival date) par chalta hai, isliye replay bhi same result deta hai.
+    State save()/load() se processed_data/alert_state.npz mein persist hota hai.
+    """
+
+    def __init__(self, sinks=None, alpha=0.05, z_threshold=5.0, min_obs=30,
+                 cooldown_days=3, commodities=None):
+        warmup = int(np.ceil(1.0 / alpha))
+        if min_obs < warmup:
+            raise ValueError(f"min_obs ({min_obs}) must be >= 1/alpha warm-up ({warmup})")
+        self.sinks = sinks if sinks is not None else []
+        self.alpha = alpha
+        self.z_threshold = z_threshold
+        self.min_obs = min_obs
+        self.cooldown = np.timedelta64(cooldown_days, 'D').astype('timedelta64[ns]').astype(np.int64)
+        self.commodities = set(commodities) if commodities else None
+
+        self.series_keys = ['commodity', 'state', 'market']
+        self.state_file = "processed_data/alert_state.npz"
+        self.index = {}
+        self.keys = []
+        # Per-series state plain lists mein (hot loop mein numpy scalars se tez)
+        self.mean = []
+        self.mad = []
+        self.count = []
+        self.last_price = []
+        self.last_alert = []
+
+        self.events = 0
+        self.suppressed = 0
+
+    def _series_id(self, key):
+        sid = self.index.get(key)
+        if sid is None:
+            sid = len(self.keys)
+            self.index[key] = sid
+            self.keys.append(key)
+            self.mean.append(0.0)
+            self.mad.append(0.0)
+            self.count.append(0)
+            self.last_price.append(0.0)
+            self.last_alert.append(None)
+        return sid
+
+    def _series_ids(self, key_frame):
+        """Batch ke unique keys ko global series ids se map karo"""
+        codes, uniques = pd.factorize(pd.MultiIndex.from_frame(key_frame))
+        ids = np.array([self._series_id(key) for key in uniques], dtype=np.int64)
+        return ids[codes]
+
+    def _step(self, sid, x, t):
+        """
+        Ek event ka O(1) state update (single aur batch dono path yahi chalate hain).
+        Alert bane to (z, expected, previous price) return, warna None
+        """
+        self.events += 1
+        n = self.count[sid]
+        if n == 0:
+            self.mean[sid] = x
+            self.mad[sid] = 0.0
+            self.count[sid] = 1
+            self.last_price[sid] = x
+            return None
+
+        m = self.mean[sid]
+        mad = self.mad[sid]
+        threshold = self.z_threshold
+        dev = x - m
+        scale = MAD_TO_SIGMA * mad
+        z = dev / scale if scale > 0 else 0.0
+
+        hit = None
+        if n >= self.min_obs and z > threshold:
+            prev = self.last_alert[sid]
+            if prev is None or t - prev >= self.cooldown:
+                self.last_alert[sid] = t
+                hit = (z, m, self.last_price[sid])
+            else:
+                self.suppressed += 1
+
+        # Spike ko state mein clip karke daalo, warna baseline khud spike ban jaata hai
+        if scale > 0 and abs(dev) > threshold * scale:
+            dev = threshold * scale if dev > 0 else -threshold * scale
+        # Warm-up mein simple running average, phir EWMA
+        a = 1.0 / (n + 1) if n + 1 < 1.0 / self.alpha else self.alpha
+        self.mean[sid] = m + a * dev
+        self.mad[sid] = (1 - a) * mad + a * abs(dev)
+        self.count[sid] = n + 1
+        self.last_price[sid] = x
+        return hit
+
+    def update(self, commodity, state, market, date, price):
+        """
+        Ek nayi arrival (plain Python, DataFrame nahi). Alert bane to sinks ko bhejo
+        aur alert dict return karo, warna None
+        """
+        if self.commodities is not None and commodity not in self.commodities:
+            return None
+        if price is None or price != price:
+            return None
+        if isinstance(date, (int, np.integer)):
+            t = int(date)
+        else:
+            date = pd.Timestamp(date)
+            if date is pd.NaT:
+                return None
+            t = date.value
+
+        sid = self._series_id((commodity, state, market))
+        hit = self._step(sid, float(price), t)
+        if hit is None:
+            return None
+        alert = self._make_alert(sid, t, float(price), *hit)
+        for sink in self.sinks:
+            sink.emit([alert])
+        return alert
+
+    def process_batch(self, df):
+        """
+        Nayi arrivals (DataFrame, event order mein) consume karo aur alerts return karo.
+        Keys/prices/dates ek baar vectorized nikalte hain, phir har event par _step
+        """
+        df = df.dropna(subset=self.series_keys + ['modal_price', 'date'])
+        if self.commodities is not None:
+            df = df[df['commodity'].isin(self.commodities)]
+        if df.empty:
+            return []
+
+        sids = self._series_ids(df[self.series_keys]).tolist()
+        prices = df['modal_price'].to_numpy(dtype=float).tolist()
+        dates = df['date'].to_numpy(dtype='datetime64[ns]').astype(np.int64).tolist()
+
+        step = self._step
+        alerts = []
+        for sid, x, t in zip(sids, prices, dates):
+            hit = step(sid, x, t)
+            if hit is not None:
+                alerts.append(self._make_alert(sid, t, x, *hit))
+
+        for sink in self.sinks:
+            sink.emit(alerts)
+        return alerts
+
+    def _make_alert(self, sid, t, price, z, expected, prev_price):
+        commodity, state, market = self.keys[sid]
+        date = pd.Timestamp(t).date()
+        alert_id = hashlib.sha1(f"{commodity}|{state}|{market}|{date}".encode()).hexdigest()[:16]
+        return {
+            'alert_id': alert_id,
+            'commodity': commodity,
+            'state': state,
+            'market': market,
+            'date': date,
+            'price': price,
+            'expected_price': round(expected, 2),
+            'robust_z': round(z, 2),
+            'change_pct': round((price - prev_price) / prev_price * 100, 2) if prev_price else 0.0,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+        }
+
+    def process(self, record):
+        """Ek single arrival (dict) ke liye - update() ka wrapper"""
+        return self.update(record['commodity'], record['state'], record['market'],
+                           record['date'], record['modal_price'])
+
+    def save(self):
+        """
+        Per-series EWMA/MAD state ko .npz checkpoint mein save karo
+        """
+        try:
+            os.makedirs(os.path.dirname(self.state_file) or '.', exist_ok=True)
+            n = len(self.keys)
+            # last_alert None -> NaT ka int64 value
+            nat = np.iinfo(np.int64).min
+            np.savez_compressed(
+                self.state_file,
+                keys=np.array(self.keys, dtype=str).reshape(n, len(self.series_keys)),
+                mean=np.array(self.mean, dtype=float),
+                mad=np.array(self.mad, dtype=float),
+                count=np.array(self.count, dtype=np.int64),
+                last_price=np.array(self.last_price, dtype=float),
+                last_alert=np.array([nat if t is None else t for t in self.last_alert],
+                                    dtype=np.int64),
+            )
+            print(f"💾 Alert state saved: {self.state_file} ({n} series)")
+            return True
+        except Exception as e:
+            print(f"❌ Error saving alert state: {e}")
+            return False
+
+    def load(self):
+        """
+        Checkpoint se state wapas load karo (plain lists, hot loop ke liye)
+        """
+        try:
+            data = np.load(self.state_file)
+            nat = np.iinfo(np.int64).min
+            self.keys = [tuple(row) for row in data['keys'].tolist()]
+            self.index = {key: i for i, key in enumerate(self.keys)}
+            self.mean = data['mean'].tolist()
+            self.mad = data['mad'].tolist()
+            self.count = data['count'].tolist()
+            self.last_price = data['last_price'].tolist()
+            self.last_alert = [None if t == nat else t for t in data['last_alert'].tolist()]
+            print(f"✅ Alert state loaded: {len(self.keys)} series")
+            return self
+        except Exception as e:
+            print(f"❌ Error loading alert state: {e}")
+            return None
+
+
+def replay(files, dayfirst=False, chunksize=500_000, **detector_kwargs):
+    """
+    Historical CSVs ko date order mein detector par chalao aur throughput report karo
+    """
+    sinks = [JsonlAlertSink(), SqliteAlertSink(), WebhookAlertSink()]
+    detector = PriceSpikeDetector(sinks=sinks, **detector_kwargs)
+
+    frames = []
+    for path in files:
+        print(f"📂 Loading {path}...")
+        for chunk in pd.read_csv(path, chunksize=chunksize,
+                                 usecols=lambda c: c in detector.series_keys + ['modal_price', 'date', 'arrival_date']):
+            if 'date' not in chunk.columns:
+                chunk['date'] = pd.to_datetime(chunk['arrival_date'], errors='coerce', dayfirst=dayfirst)
+            else:
+                chunk['date'] = pd.to_datetime(chunk['date'], errors='coerce')
+            chunk['modal_price'] = pd.to_numeric(chunk['modal_price'], errors='coerce')
+            frames.append(chunk)
+
+    events = pd.concat(frames, ignore_index=True).sort_values('date', kind='mergesort')
+
+    start = time.perf_counter()
+    alerts = []
+    for begin in range(0, len(events), chunksize):
+        alerts.extend(detector.process_batch(events.iloc[begin:begin + chunksize]))
+    elapsed = time.perf_counter() - start
+
+    rate = detector.events / elapsed if elapsed > 0 else float('inf')
+    print(f"\n✅ Replay complete: {detector.events} events in {elapsed:.2f}s ({rate:,.0f} events/sec)")
+    print(f"   Alerts: {len(alerts)}  |  Suppressed by cooldown: {detector.suppressed}")
+
+    # Online ingest (feature_store.py ingest) isi state se aage chalta hai
+    detector.save()
+    return alerts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AgriSense price-spike alert replay")
+    parser.add_argument('files', nargs='*', default=["processed_data/clean_commodity_prices.csv"])
+    parser.add_argument('--dayfirst', action='store_true', help="arrival_date DD/MM/YYYY format mein hai")
+    parser.add_argument('--all-commodities', action='store_true', help="sirf staples nahi, sab commodities")
+    parser.add_argument('--threshold', type=float, default=5.0)
+    parser.add_argument('--cooldown-days', type=int, default=3)
+    args = parser.parse_args()
+
+    print("🚨 AgriSense Price-Spike Alert Replay\n")
+    replay(args.files, dayfirst=args.dayfirst,
+           z_threshold=args.threshold, cooldown_days=args.cooldown_days,
+           commodities=None if args.all_commodities else STAPLE_COMMODITIES)
@@ -0,0 +1,52 @@
+import pandas as pd
+import json
+import os
+
+
+def publish_dashboard_data(csv_path="processed_data/featured_data.csv",
+                           arrow_path="processed_data/dashboard_data.arrow"):
+    """
+    Dashboard dataset ko ek baar uncompressed Arrow (Feather v2) file mein publish karo.
+    Har gunicorn worker is file ko read-only memory-map karta hai, isliye OS page
+    cache ki ek hi copy sab workers share karte hain aur startup par CSV parse nahi hota.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.feather as feather
+    except ImportError:
+        print("⚠️  pyarrow not installed, dashboard will read the CSV directly")
+        return None
+
+    try:
+        print(f"\n📦 Publishing dashboard dataset from: {csv_path}")
+        df = pd.read_csv(csv_path)
+        df['date'] = pd.to_datetime(df['date'], errors='coerce')
+        df = df.dropna(subset=['date', 'modal_price'])
+        df = df.sort_values(['commodity', 'date'], kind='mergesort').reset_index(drop=True)
+
+        # Commodity -> (start, length): sorted table mein har commodity ek contiguous slice hai
+        bounds = df.groupby('commodity', sort=True).indices
+        offsets = {c: [int(idx[0]), int(len(idx))] for c, idx in bounds.items()}
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            b'agrisense_offsets': json.dumps(offsets).encode(),
+        })
+
+        # Temp file + rename: chalte workers ko kabhi aadhi likhi file nahi dikhegi
+        tmp_path = f"{arrow_path}.tmp"
+        feather.write_feather(table, tmp_path, compression='uncompressed')
+        os.replace(tmp_path, arrow_path)
+
+        size_mb = os.path.getsize(arrow_path) / 1e6
+        print(f"✅ Dashboard dataset published: {arrow_path} ({len(df)} rows, {size_mb:.1f} MB)")
+        return arrow_path
+
+    except Exception as e:
+        print(f"❌ Error publishing dashboard data: {e}")
+        return None
+
+
+if __name__ == "__main__":
+    publish_dashboard_data()
@@ -0,0 +1,204 @@
+import pandas as pd
+import numpy as np
+import os
+
+
+class MarketSpreadAnalyzer:
+    """
+    Same commodity ke liye har din markets ke beech price spread.
+    Data ek baar (commodity, date, price) par sort hota hai; har commodity-day
+    ek contiguous sorted slice hai, isliye min/max/median order statistics hain
+    aur top-k widest pairs sirf k sabse saste x k sabse mehenge markets se
+    aate hain - O(markets²) self-join ki zarurat nahi.
+    """
+
+    def __init__(self, top_k=5, rolling_windows=(7, 30)):
+        self.top_k = top_k
+        self.rolling_windows = rolling_windows
+        self.processed_path = "processed_data"
+        self.spreads_file = f"{self.processed_path}/market_spreads.csv"
+        self.pairs_file = f"{self.processed_path}/market_spread_pairs.csv"
+
+        os.makedirs(self.processed_path, exist_ok=True)
+
+    def _market_prices(self, df):
+        """
+        Ek market ke ek din mein multiple rows (varieties/grades) ho to average lo,
+        phir (commodity, date, price) par sort karo. Strings par groupby/sort ki
+        jagah integer codes use hote hain. Market (market, state) pair hai - same naam
+        alag states mein alag market - isliye labels mein dono columns hain.
+        """
+        df = df.dropna(subset=['commodity', 'market', 'date', 'modal_price'])
+        c_codes, c_names = pd.factorize(df['commodity'], sort=True)
+        m_codes, m_names = pd.factorize(df['market'])
+        m_codes = m_codes.astype(np.int64)
+        n_states = 1
+        s_names = np.array([None], dtype=object)
+        if 'state' in df.columns:
+            # Same market naam alag states mein alag market hai
+            s_codes, s_names = pd.factorize(df['state'], use_na_sentinel=False)
+            n_states = max(len(s_names), 1)
+            m_codes = m_codes * n_states + s_codes
+        m_codes, m_combined = pd.factorize(m_codes)
+        m_combined = np.asarray(m_combined)
+        market_labels = pd.DataFrame({
+            'market': np.asarray(m_names, dtype=object)[m_combined // n_states],
+            'state': np.asarray(s_names, dtype=object)[m_combined % n_states],
+        })
+
+        day = df['date'].to_numpy(dtype='datetime64[D]').astype(np.int64)
+        day0 = day.min() if len(day) else 0
+        n_days = int(day.max() - day0 + 1) if len(day) else 1
+        n_markets = max(len(market_labels), 1)
+
+        # (commodity, day, market) ek int64 key; np.unique sorted order bhi deta hai
+        key = (c_codes.astype(np.int64) * n_days + (day - day0)) * n_markets + m_codes
+        keys, inverse = np.unique(key, return_inverse=True)
+        price = np.bincount(inverse, weights=df['modal_price'].to_numpy(dtype=float)) / np.bincount(inverse)
+
+        group = keys // n_markets
+        market_code = keys % n_markets
+        # Group ke andar price order: np.lexsort se tez composite int key (dense group, price rank)
+        dense = np.concatenate([[0], np.cumsum(group[1:] != group[:-1])])
+        rank = np.empty(len(price), dtype=np.int64)
+        rank[np.argsort(price)] = np.arange(len(price))
+        order = np.argsort(dense * len(price) + rank)
+        group, market_code, price = group[order], market_code[order], price[order]
+
+        # Names sirf output rows (group starts/ends, pairs) par resolve hote hain
+        prices = pd.DataFrame({
+            'group': group,
+            'commodity': pd.Categorical.from_codes(group // n_days, categories=np.asarray(c_names, dtype=object)),
+            'date': (group % n_days + day0).astype('datetime64[D]').astype('datetime64[ns]'),
+            'market_code': market_code,
+            'modal_price': price,
+        })
+        return prices, market_labels
+
+    def daily_spreads(self, prices, market_labels):
+        """
+        Har commodity-day ke liye min/median/max aur spread (sorted slice se).
+        market_labels: market code -> (market, state)
+        """
+        commodity = prices['commodity']
+        date = prices['date'].to_numpy()
+        price = prices['modal_price'].to_numpy(dtype=float)
+        market_code = prices['market_code'].to_numpy()
+        group = prices['group'].to_numpy()
+        markets = market_labels['market'].to_numpy()
+        states = market_labels['state'].to_numpy()
+
+        # Group boundaries: jahan commodity-day badle
+        new_group = np.ones(len(prices), dtype=bool)
+        new_group[1:] = group[1:] != group[:-1]
+        starts = np.flatnonzero(new_group)
+        ends = np.append(starts[1:], len(prices)) - 1
+        counts = ends - starts + 1
+
+        # Median bhi order statistic hai: beech wale do elements ka average
+        mid_low = starts + (counts - 1) // 2
+        mid_high = starts + counts // 2
+
+        spreads = pd.DataFrame({
+            'commodity': np.asarray(commodity.iloc[starts], dtype=object),
+            'date': date[starts],
+            'markets': counts,
+            'min_price': price[starts],
+            'median_price': (price[mid_low] + price[mid_high]) / 2,
+            'max_price': price[ends],
+            'cheapest_market': markets[market_code[starts]],
+            'cheapest_state': states[market_code[starts]],
+            'costliest_market': markets[market_code[ends]],
+            'costliest_state': states[market_code[ends]],
+        })
+        spreads['spread'] = spreads['max_price'] - spreads['min_price']
+        spreads['spread_pct'] = np.where(spreads['min_price'] > 0,
+                                         spreads['spread'] / spreads['min_price'] * 100, np.nan)
+
+        # Rolling spread history (per commodity, calendar days par - jin dino data
+        # nahi aaya wo window mein gine nahi jaate, window unhe skip karke lambi nahi hoti)
+        # spreads pehle se (commodity, date) sorted hai, isliye result position se align hota hai
+        grouped = spreads.groupby('commodity', sort=False)
+        for window in self.rolling_windows:
+            rolled = grouped.rolling(f'{window}D', on='date', min_periods=1)['spread'].mean()
+            spreads[f'spread_{window}day_avg'] = rolled.to_numpy()
+        return spreads, starts, counts
+
+    def top_pairs(self, prices, market_labels, starts, counts):
+        """
+        Har commodity-day ke top-k widest (cheap, costly) market pairs.
+        Widest pairs hamesha k sabse saste aur k sabse mehenge markets ke beech hote hain,
+        isliye har group mein sirf k x k candidates dekhne padte hain.
+        """
+        k = self.top_k
+        price = prices['modal_price'].to_numpy(dtype=float)
+        market_code = prices['market_code'].to_numpy()
+        markets = market_labels['market'].to_numpy()
+        states = market_labels['state'].to_numpy()
+
+        # (groups, k, k) candidates: low = start + i, high = end - j
+        offsets = np.arange(k)
+        low = starts[:, None, None] + offsets[None, :, None]
+        high = (starts + counts - 1)[:, None, None] - offsets[None, None, :]
+        valid = (offsets[None, :, None] < counts[:, None, None]) & \
+                (offsets[None, None, :] < counts[:, None, None]) & (low < high)
+
+        low = np.where(valid, low, 0)
+        high = np.where(valid, high, 0)
+        # Position alag hone se price alag nahi hota: barabar price wale (0 spread) pair nahi
+        valid &= price[high] > price[low]
+        gap = np.where(valid, price[high] - price[low], -np.inf)
+
+        # Har group mein gap ke hisaab se top-k
+        flat_gap = gap.reshape(len(starts), k * k)
+        order = np.argsort(-flat_gap, axis=1, kind='stable')[:, :k]
+        best_gap = np.take_along_axis(flat_gap, order, axis=1)
+        keep = np.isfinite(best_gap)
+
+        group_idx = np.broadcast_to(np.arange(len(starts))[:, None], order.shape)[keep]
+        rank = np.broadcast_to(np.arange(1, k + 1)[None, :], order.shape)[keep]
+        low_idx = np.take_along_axis(low.reshape(len(starts), k * k), order, axis=1)[keep]
+        high_idx = np.take_along_axis(high.reshape(len(starts), k * k), order, axis=1)[keep]
+
+        return pd.DataFrame({
+            'commodity': np.asarray(prices['commodity'].iloc[starts], dtype=object)[group_idx],
+            'date': prices['date'].to_numpy()[starts][group_idx],
+            'rank': rank,
+            'buy_market': markets[market_code[low_idx]],
+            'buy_state': states[market_code[low_idx]],
+            'buy_price': price[low_idx],
+            'sell_market': markets[market_code[high_idx]],
+            'sell_state': states[market_code[high_idx]],
+            'sell_price': price[high_idx],
+            'spread': best_gap[keep],
+        })
+
+    def compute(self, df):
+        """
+        Daily spreads aur top-k pairs banao aur tables save karo
+        """
+        try:
+            print(f"\n↔️  Computing cross-market price spreads...")
+            prices, market_labels = self._market_prices(df)
+            spreads, starts, counts = self.daily_spreads(prices, market_labels)
+            pairs = self.top_pairs(prices, market_labels, starts, counts)
+
+            spreads.to_csv(self.spreads_file, index=False)
+            pairs.to_csv(self.pairs_file, index=False)
+            print(f"✅ Spreads saved: {self.spreads_file} ({len(spreads)} commodity-days)")
+            print(f"✅ Top-{self.top_k} market pairs saved: {self.pairs_file} ({len(pairs)} rows)")
+            return spreads, pairs
+
+        except Exception as e:
+            print(f"❌ Error in spread analytics: {e}")
+            return None, None
+
+
+if __name__ == "__main__":
+    clean_df = pd.read_csv("processed_data/clean_commodity_prices.csv")
+    clean_df['date'] = pd.to_datetime(clean_df['date'], errors='coerce')
+
+    analyzer = MarketSpreadAnalyzer()
+    spreads, pairs = analyzer.compute(clean_df)
+    if spreads is not None:
+        print(spreads.sort_values('spread_pct', ascending=False).head())
@@ -0,0 +1,90 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+
+# Repo root se chalao: python scripts/startup_profile.py
+# Har entry point ko fresh interpreter mein `-X importtime` ke saath import karta hai
+# aur top-level package wise import time ka breakdown dikhata hai.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGETS = {
+    'dashboard': "import runpy; runpy.run_path('dashboard/app.py', run_name='app')",
+    'ml_models': "import sys; sys.path.insert(0, 'scripts'); import ml_models",
+    'data_pipeline': "import sys; sys.path.insert(0, 'scripts'); import data_pipeline",
+    'data_collector': "import sys; sys.path.insert(0, 'scripts'); import data_collector",
+}
+
+
+def import_breakdown(code):
+    """
+    (wall time, {package: self-time us}) - importtime ka stderr parse karke
+    """
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            cwd=ROOT, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+
+    per_package = defaultdict(int)
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        fields = line.split(':', 1)[1].split('|')
+        package = fields[2].strip().split('.')[0]
+        per_package[package] += int(fields[0])
+    return wall, per_package
+
+
+def time_to_health(port=8766, timeout=60):
+    """Gunicorn worker boot se /health ke pehle response tak ka time (ready ho ya loading)"""
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-w', '1', '-b', f'127.0.0.1:{port}', 'dashboard.app:server'],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    first_response = ready = None
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                urllib.request.urlopen(f'http://127.0.0.1:{port}/health', timeout=1)
+                ready = time.perf_counter() - start
+                first_response = first_response or ready
+                break
+            except urllib.error.HTTPError as e:
+                # 503 = server up hai, data abhi load ho raha hai
+                if e.code == 503 and first_response is None:
+                    first_response = time.perf_counter() - start
+            except Exception:
+                pass
+            time.sleep(0.02)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+    return first_response, ready
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AgriSense startup profile (import-time breakdown)")
+    parser.add_argument('targets', nargs='*', default=list(TARGETS))
+    parser.add_argument('--top', type=int, default=8)
+    parser.add_argument('--serve', action='store_true', help="gunicorn boot -> /health time bhi naapo")
+    args = parser.parse_args()
+
+    print("⏱️  AgriSense Startup Profile\n")
+    for target in args.targets:
+        wall, per_package = import_breakdown(TARGETS[target])
+        total_ms = sum(per_package.values()) / 1000
+        print(f"📦 {target}: {wall * 1000:.0f} ms wall, {total_ms:.0f} ms in imports")
+        for package, us in sorted(per_package.items(), key=lambda kv: -kv[1])[:args.top]:
+            print(f"   {package:<24} {us / 1000:>8.1f} ms")
+        print()
+
+    if args.serve:
+        first_response, ready = time_to_health()
+        fmt = lambda t: f"{t:.2f}s" if t is not None else "timeout"
+        print(f"🌐 Dashboard: first /health response {fmt(first_response)}, data ready {fmt(ready)}")
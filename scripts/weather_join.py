@@ -0,0 +1,203 @@
+import pandas as pd
+import numpy as np
+import os
+from entity_normalizer import EntityNormalizer
+
+# Weather stations (DataCollector.fetch_weather_data ke default cities)
+STATION_COORDS = {
+    'Delhi': (28.61, 77.21),
+    'Mumbai': (19.08, 72.88),
+    'Bangalore': (12.97, 77.59),
+    'Chennai': (13.08, 80.27),
+    'Kolkata': (22.57, 88.36),
+}
+
+# State/UT ke approximate centre coordinates, data/entity_aliases.json ke canonical
+# state names par keyed. Mapping state-level hai: ek state ki saari mandis ko
+# same (nearest) station milta hai - district/market coordinates abhi nahi hain.
+STATE_COORDS = {
+    'Andaman and Nicobar Islands': (11.74, 92.66),
+    'Andhra Pradesh': (15.91, 79.74),
+    'Arunachal Pradesh': (28.22, 94.73),
+    'Assam': (26.20, 92.94),
+    'Bihar': (25.10, 85.31),
+    'Chandigarh': (30.73, 76.78),
+    'Chhattisgarh': (21.28, 81.87),
+    'Dadra and Nagar Haveli and Daman and Diu': (20.27, 73.02),
+    'Delhi': (28.61, 77.21),
+    'Goa': (15.30, 74.12),
+    'Gujarat': (22.26, 71.19),
+    'Haryana': (29.06, 76.09),
+    'Himachal Pradesh': (31.10, 77.17),
+    'Jammu and Kashmir': (33.78, 76.58),
+    'Jharkhand': (23.61, 85.28),
+    'Karnataka': (15.32, 75.71),
+    'Kerala': (10.85, 76.27),
+    'Ladakh': (34.15, 77.58),
+    'Lakshadweep': (10.57, 72.64),
+    'Madhya Pradesh': (22.97, 78.66),
+    'Maharashtra': (19.75, 75.71),
+    'Manipur': (24.66, 93.91),
+    'Meghalaya': (25.47, 91.37),
+    'Mizoram': (23.16, 92.94),
+    'Nagaland': (26.16, 94.56),
+    'Odisha': (20.95, 85.10),
+    'Puducherry': (11.94, 79.81),
+    'Punjab': (31.15, 75.34),
+    'Rajasthan': (27.02, 74.22),
+    'Sikkim': (27.53, 88.51),
+    'Tamil Nadu': (11.13, 78.66),
+    'Telangana': (18.11, 79.02),
+    'Tripura': (23.94, 91.99),
+    'Uttar Pradesh': (26.85, 80.95),
+    'Uttarakhand': (30.07, 79.02),
+    'West Bengal': (22.99, 87.85),
+}
+
+
+class WeatherJoiner:
+    def __init__(self, weather_file="data/weather_data.csv", tolerance_days=7):
+        self.weather_file = weather_file
+        self.processed_path = "processed_data"
+        self.lookup_file = f"{self.processed_path}/state_station_lookup.csv"
+        self.tolerance = pd.Timedelta(days=tolerance_days)
+        self.weather_cols = ['temperature', 'humidity', 'pressure',
+                             'rainfall_3day', 'rainfall_7day',
+                             'temp_3day_mean', 'temp_7day_mean']
+
+        os.makedirs(self.processed_path, exist_ok=True)
+
+    def build_station_lookup(self, df):
+        """
+        Har state ko uske centre ke nearest weather station se map karo (state-level).
+        Sirf unique states par haversine chalta hai, rows par nahi.
+        """
+        states = df[['state']].drop_duplicates().dropna().reset_index(drop=True)
+        states['state'] = states['state'].astype(str)
+
+        # Raw/alias names (jaise 'Orissa', 'Jammu And Kashmir') bhi canonical coords par aayen
+        canonical, _ = EntityNormalizer().map_names(states['state'], 'state')
+        coords = pd.Series(canonical).map(STATE_COORDS)
+        known = coords.notna().to_numpy()
+        lat = np.array([c[0] if isinstance(c, tuple) else np.nan for c in coords])
+        lon = np.array([c[1] if isinstance(c, tuple) else np.nan for c in coords])
+
+        stations = list(STATION_COORDS.keys())
+        st_lat = np.radians([STATION_COORDS[s][0] for s in stations])
+        st_lon = np.radians([STATION_COORDS[s][1] for s in stations])
+
+        # Haversine distance matrix: (states x stations)
+        lat_r = np.radians(lat)[:, None]
+        lon_r = np.radians(lon)[:, None]
+        a = (np.sin((st_lat - lat_r) / 2) ** 2 +
+             np.cos(lat_r) * np.cos(st_lat) * np.sin((st_lon - lon_r) / 2) ** 2)
+        dist_km = 2 * 6371 * np.arcsin(np.sqrt(a))
+
+        nearest = np.argmin(np.where(np.isnan(dist_km), np.inf, dist_km), axis=1)
+        states['station'] = np.where(known, np.array(stations)[nearest], None)
+        states['station_distance_km'] = np.where(
+            known, dist_km[np.arange(len(states)), nearest], np.nan
+        ).round(1)
+
+        states.to_csv(self.lookup_file, index=False)
+        print(f"✅ Station lookup saved: {self.lookup_file} ({len(states)} states)")
+        if (~known).any():
+            print(f"⚠️  No coordinates (no weather) for: {', '.join(states.loc[~known, 'state'])}")
+        return states
+
+    def load_station_lookup(self, df):
+        """
+        Saved lookup use karo, naye states aaye to rebuild karo
+        """
+        if os.path.exists(self.lookup_file):
+            lookup = pd.read_csv(self.lookup_file)
+            needed = set(df['state'].dropna().astype(str).unique())
+            if 'state' in lookup.columns and needed.issubset(set(lookup['state'].astype(str))):
+                return lookup
+        return self.build_station_lookup(df)
+
+    def prepare_weather(self):
+        """
+        Weather observations load karo aur lagged aggregates vectorized banao
+        """
+        weather = pd.read_csv(self.weather_file)
+        weather['timestamp'] = pd.to_datetime(weather['timestamp'], errors='coerce')
+        weather = weather.dropna(subset=['city', 'timestamp'])
+        weather = weather.rename(columns={'city': 'station'})
+
+        if 'rainfall' not in weather.columns:
+            weather['rainfall'] = 0.0
+        weather['rainfall'] = pd.to_numeric(weather['rainfall'], errors='coerce').fillna(0.0)
+
+        weather = weather.sort_values(['station', 'timestamp']).reset_index(drop=True)
+
+        # Time-based rolling windows, har station ke liye ek hi pass mein
+        rolled = weather.set_index('timestamp').groupby('station', sort=False)
+        weather['rainfall_3day'] = rolled['rainfall'].rolling('3D').sum().to_numpy()
+        weather['rainfall_7day'] = rolled['rainfall'].rolling('7D').sum().to_numpy()
+        weather['temp_3day_mean'] = rolled['temperature'].rolling('3D').mean().to_numpy()
+        weather['temp_7day_mean'] = rolled['temperature'].rolling('7D').mean().to_numpy()
+
+        cols = ['station', 'timestamp'] + self.weather_cols
+        return weather[cols]
+
+    def join_weather(self, df):
+        """
+        Har price row par arrival date tak ka latest weather observation lagao
+        (sorted as-of merge, row-by-row loop nahi).
+        'date' arrival din ki midnight hai, isliye usi din baad mein aaye observations
+        nahi judte - sirf pichhle observations (tolerance ke andar), future leak nahi.
+        """
+        print(f"\n🌦️  Joining weather data from: {self.weather_file}")
+        try:
+            if not os.path.exists(self.weather_file):
+                print("⚠️  Weather file not found, skipping join")
+                return df
+            lookup = self.load_station_lookup(df)
+            weather = self.prepare_weather()
+        except (OSError, KeyError, pd.errors.ParserError, pd.errors.EmptyDataError) as e:
+            # Sirf weather source padhne ki galti par bina weather ke aage badho;
+            # join ki galti (jaise merge keys) upar jaani chahiye, chup-chaap 0 matches nahi
+            print(f"❌ Error reading weather data, skipping join: {e}")
+            return df
+
+        df = df.drop(columns=[c for c in self.weather_cols + ['station']
+                              if c in df.columns])
+        station = lookup.set_index(lookup['state'].astype(str))['station']
+        df['station'] = df['state'].astype(str).map(station)
+
+        # merge_asof ko 'on' key sorted chahiye; original order (position se) baad mein wapas
+        left = pd.DataFrame({'_row': np.arange(len(df)), 'station': df['station'].to_numpy(),
+                             'date': df['date'].to_numpy()})
+        left = left.dropna(subset=['date']).sort_values('date', kind='mergesort')
+        left['station'] = left['station'].astype(str)
+        weather['station'] = weather['station'].astype(str)
+        weather = weather.sort_values('timestamp', kind='mergesort')
+
+        # Dono keys ek hi datetime unit mein (pandas 3 CSV se [us], date_range/Timestamp se [ns])
+        left['date'] = left['date'].astype('datetime64[ns]')
+        weather['timestamp'] = weather['timestamp'].astype('datetime64[ns]')
+
+        joined = pd.merge_asof(
+            left, weather,
+            left_on='date', right_on='timestamp',
+            by='station', direction='backward',
+            tolerance=self.tolerance
+        )
+
+        joined = joined.set_index('_row')[self.weather_cols].reindex(np.arange(len(df)))
+        for col in self.weather_cols:
+            df[col] = joined[col].to_numpy()
+
+        matched = df['temperature'].notna().sum()
+        print(f"✅ Weather attached to {matched}/{len(df)} rows")
+        return df
+
+
+if __name__ == "__main__":
+    clean_df = pd.read_csv("processed_data/clean_commodity_prices.csv")
+    clean_df['date'] = pd.to_datetime(clean_df['date'], errors='coerce')
+
+    joiner = WeatherJoiner()
+    joined_df = joiner.join_weather(clean_df)
+    print(joined_df[['commodity', 'state', 'date'] + joiner.weather_cols].head())
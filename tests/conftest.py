@@ -0,0 +1,45 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# scripts/ flat modules hain (package nahi), isliye unhe import path par daalo
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    """Scripts processed_data/ relative path par likhte hain - har test apni tmp dir mein"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def price_panel():
+    """
+    (commodity, state, market) series ka long-format price frame banane wala factory.
+    n_days int (sab series same length) ya har series ki length ki list ho sakta hai;
+    n_markets < series count ho to same market naam kai states mein aata hai.
+    """
+    def make(n_days, n_series=None, seed=0, commodities=('Onion',), n_states=3,
+             n_markets=None, loc=1000.0, scale=20.0, walk=False, decimals=None):
+        rng = np.random.default_rng(seed)
+        lengths = [n_days] * n_series if np.isscalar(n_days) else list(n_days)
+        n_markets = n_markets or len(lengths)
+        frames = []
+        for i, n in enumerate(lengths):
+            noise = rng.normal(0, scale, n)
+            frames.append(pd.DataFrame({
+                'commodity': commodities[i % len(commodities)],
+                'state': f'State{i % n_states}',
+                'market': f'Market{i % n_markets}',
+                'date': pd.date_range('2025-01-01', periods=n, freq='D'),
+                'modal_price': loc + (noise.cumsum() if walk else noise),
+            }))
+        df = pd.concat(frames, ignore_index=True)
+        if decimals is not None:
+            df['modal_price'] = df['modal_price'].round(decimals)
+        return df
+    return make
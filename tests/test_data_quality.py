@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_quality import DataQualityValidator
+
+
+@pytest.fixture(params=['parquet', 'csv'])
+def validator(request):
+    if request.param == 'parquet':
+        pytest.importorskip('pyarrow')
+    validator = DataQualityValidator(known_states=['Kerala', 'Odisha'])
+    # pyarrow na ho to CSV fallback
+    validator.rows_format = request.param
+    return validator
+
+
+def make_rows(commodity):
+    return pd.DataFrame({
+        'commodity': pd.Categorical([commodity, commodity, 'Onion', 'Garlic']),
+        'market': ['M1', 'M2', 'M3', 'M4'],
+        'state': ['Kerala', 'Atlantis', 'Odisha', 'Kerala'],
+        'date': pd.to_datetime(['2025-01-01'] * 4),
+        'min_price': [900.0, 900.0, 1100.0, 900.0],
+        'modal_price': [1000.0, 1000.0, 1000.0, np.nan],
+        'max_price': [1100.0, 1100.0, 1200.0, 1100.0],
+    })
+
+
+def test_rule_bits(validator):
+    mask = validator.validate(make_rows('Tomato'))
+    bits = validator.RULES
+    assert mask.dtype == np.uint32
+    assert mask[0] == 0
+    assert mask[1] == 1 << bits['unknown_state']
+    assert mask[2] == 1 << bits['min_gt_modal']
+    assert mask[3] == 1 << bits['missing_required']
+
+
+def test_quarantine_kept_per_source(validator):
+    clean_a, _ = validator.split(make_rows('Tomato'), source='a.csv')
+    validator.split(make_rows('Potato'), source='b.csv')
+
+    for source in ['a.csv', 'b.csv']:
+        rows = validator.load_quarantine(source)
+        assert len(rows) == 3
+        assert rows['dq_mask'].tolist() == list(validator.validate(make_rows('Tomato'))[1:])
+
+    summary = pd.read_csv(validator.summary_file)
+    assert sorted(summary['source'].unique()) == ['a.csv', 'b.csv']
+
+    # Saaf source ki purani quarantine hat jaati hai, doosre source ki rehti hai
+    validator.split(make_rows('Tomato').iloc[[0]], source='a.csv')
+    assert list(pd.read_csv(validator.summary_file)['source'].unique()) == ['b.csv']
+
+    # Sirf quarantined rows wali categories clean data mein nahi rehti
+    assert list(clean_a['commodity'].cat.categories) == ['Tomato']
@@ -0,0 +1,66 @@
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from entity_normalizer import EntityNormalizer
+
+ALIAS_FILE = Path(__file__).resolve().parent.parent / "data" / "entity_aliases.json"
+
+
+@pytest.fixture
+def normalizer(tmp_path):
+    table = {
+        'version': 1,
+        'commodity': {'aliases': {'Raddish': 'Radish'}, 'canonical': ['Onion', 'Tomato']},
+        'state': {'aliases': {'Orissa': 'Odisha'}, 'canonical': ['Odisha', 'Kerala']},
+        'market': {'aliases': {}, 'canonical': []},
+    }
+    path = tmp_path / "entity_aliases.json"
+    path.write_text(json.dumps(table))
+    return EntityNormalizer(alias_file=str(path))
+
+
+def test_suggestions_only_point_at_canonical_names(normalizer):
+    rows = normalizer.suggest(['Onoin', 'Tomatto', 'Mannargudi I', 'Mannargudi II'], 'commodity')
+    assert {(r['name'], r['suggestion']) for r in rows} == {('Onoin', 'Onion'), ('Tomatto', 'Tomato')}
+    # Market ki canonical list khaali hai: unseen names aapas mein match nahi hone chahiye
+    assert normalizer.suggest(['Mannargudi I', 'Mannargudi II'], 'market') == []
+
+
+def test_seed_canonical_makes_current_names_known(normalizer):
+    df = pd.DataFrame({'commodity': ['onion', 'Raddish', 'Garlic'],
+                       'state': ['Orissa', 'Kerala', 'Kerala'],
+                       'market': ['Cuttack', 'Kochi', 'Kochi']})
+    normalizer.seed_canonical(df)
+
+    assert normalizer.version == 2
+    assert normalizer.canonical['commodity'] == ['Garlic', 'Onion', 'Radish', 'Tomato']
+    assert normalizer.canonical['state'] == ['Kerala', 'Odisha']
+    for entity in EntityNormalizer.ENTITIES:
+        _, unseen, _, _ = normalizer.normalize_column(df[entity], entity)
+        assert unseen == []
+
+
+def test_seed_canonical_holds_back_spelling_variants(normalizer):
+    df = pd.DataFrame({'commodity': ['Cluster Beans'] * 3 + ['Duster Beans'],
+                       'state': 'Kerala',
+                       'market': ['Kochi', 'Kochi', 'Kochi', 'Kochin']})
+    normalizer.seed_canonical(df)
+
+    # Zyada rows wala name canonical banta hai, variant review ke liye rukta hai
+    assert 'Cluster Beans' in normalizer.canonical['commodity']
+    assert 'Duster Beans' not in normalizer.canonical['commodity']
+    assert normalizer.canonical['market'] == ['Kochi']
+
+    held = pd.read_csv(normalizer.suggestions_file)
+    assert set(zip(held['name'], held['suggestion'])) == {('Duster Beans', 'Cluster Beans'),
+                                                         ('Kochin', 'Kochi')}
+
+
+def test_shipped_alias_table_merges_known_variants():
+    normalizer = EntityNormalizer(alias_file=str(ALIAS_FILE))
+    mapped, unseen = normalizer.map_names(['Duster Beans', 'Seetapal', 'Cluster Beans'], 'commodity')
+    assert list(mapped) == ['Cluster Beans', 'Custard Apple (Sharifa)', 'Cluster Beans']
+    assert unseen == []
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from price_alerts import JsonlAlertSink, PriceSpikeDetector
+
+
+@pytest.fixture
+def make_arrivals(price_panel):
+    """N(1000, 20) prices event (date) order mein, 10 rows par 3x spike"""
+    def make():
+        df = price_panel(200, n_series=20).sort_values('date', kind='mergesort').reset_index(drop=True)
+        rng = np.random.default_rng(1)
+        spikes = rng.choice(np.flatnonzero(df['date'] >= pd.Timestamp('2025-03-02')), 10, replace=False)
+        df.loc[spikes, 'modal_price'] *= 3
+        return df, df.iloc[spikes]
+    return make
+
+
+def alert_keys(alerts):
+    return sorted((a['market'], str(a['date'])) for a in alerts)
+
+
+def test_single_event_path_matches_batch(make_arrivals):
+    df, _ = make_arrivals()
+    batch = PriceSpikeDetector().process_batch(df)
+
+    detector = PriceSpikeDetector()
+    single = [a for a in (detector.process(r) for r in df.to_dict('records')) if a]
+
+    assert alert_keys(single) == alert_keys(batch)
+    assert detector.events == len(df)
+
+
+def test_injected_spikes_alert_without_noise(make_arrivals):
+    df, spikes = make_arrivals()
+    alerts = PriceSpikeDetector().process_batch(df)
+    expected = sorted(zip(spikes['market'], spikes['date'].dt.date.astype(str)))
+    assert alert_keys(alerts) == expected
+
+
+def test_jsonl_sink_skips_replayed_alerts(make_arrivals, tmp_path):
+    df, spikes = make_arrivals()
+    path = str(tmp_path / "alerts.jsonl")
+    for _ in range(2):
+        PriceSpikeDetector(sinks=[JsonlAlertSink(path)]).process_batch(df)
+
+    with open(path) as f:
+        assert len(f.readlines()) == len(spikes)
+
+
+def test_min_obs_below_warmup_raises():
+    with pytest.raises(ValueError):
+        PriceSpikeDetector(alpha=0.05, min_obs=10)
+
+
+def test_saved_state_resumes_like_uninterrupted_run(make_arrivals):
+    df, spikes = make_arrivals()
+    half = len(df) // 2
+
+    first = PriceSpikeDetector()
+    alerts = first.process_batch(df.iloc[:half])
+    assert first.save()
+
+    resumed = PriceSpikeDetector().load()
+    assert resumed is not None
+    alerts += resumed.process_batch(df.iloc[half:])
+
+    assert alert_keys(alerts) == alert_keys(PriceSpikeDetector().process_batch(df))
+    assert sum(resumed.count) == len(df)
+
+
+def test_feature_store_ingest_runs_detector_and_persists_state(make_arrivals):
+    from feature_store import FeatureStateStore
+
+    df, spikes = make_arrivals()
+    half = len(df) // 2
+    history = PriceSpikeDetector()
+    history.process_batch(df.iloc[:half])
+    history.save()
+
+    store = FeatureStateStore(flush_every=10_000, detector=PriceSpikeDetector())
+    results = store.ingest(df.iloc[half:].to_dict('records'))
+    store.flush()
+
+    late = df.iloc[half:]
+    flagged = late[[r['spike_alert'] for r in results]]
+    expected = spikes[spikes.index >= half]
+    assert sorted(flagged.index) == sorted(expected.index)
+    assert sum(PriceSpikeDetector().load().count) == len(df)
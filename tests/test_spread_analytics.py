@@ -0,0 +1,109 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from spread_analytics import MarketSpreadAnalyzer
+
+
+@pytest.fixture
+def analyzer():
+    return MarketSpreadAnalyzer(top_k=3)
+
+
+@pytest.fixture
+def make_prices(price_panel):
+    """
+    Kuch market naam kai states mein (Market0..7 x State0..2), ek market-day par
+    do rows (varieties) - aur rounded prices taaki ties bhi aayein
+    """
+    def make():
+        panel = lambda seed: price_panel(20, n_series=48, seed=seed, commodities=('Onion', 'Tomato'),
+                                         n_markets=8, scale=100.0, decimals=-1)
+        return pd.concat([panel(0), panel(1)], ignore_index=True)
+    return make
+
+
+def brute_force(df, k):
+    """Har commodity-day ke saare (market, state) pairs compare karke"""
+    per_market = df.groupby(['commodity', 'date', 'market', 'state'])['modal_price'].mean().reset_index()
+    daily, pairs = [], []
+    for (commodity, date), g in per_market.groupby(['commodity', 'date']):
+        prices = g['modal_price'].to_numpy()
+        daily.append({'commodity': commodity, 'date': date, 'markets': len(g),
+                      'min_price': prices.min(), 'median_price': np.median(prices),
+                      'max_price': prices.max()})
+        gaps = sorted((b.modal_price - a.modal_price for a, b in
+                       itertools.permutations(g.itertuples(), 2) if b.modal_price > a.modal_price),
+                      reverse=True)
+        pairs.extend({'commodity': commodity, 'date': date, 'rank': i + 1, 'spread': gap}
+                     for i, gap in enumerate(gaps[:k]))
+    return pd.DataFrame(daily), pd.DataFrame(pairs)
+
+
+def test_matches_brute_force(analyzer, make_prices):
+    df = make_prices()
+    spreads, pairs = analyzer.compute(df)
+    expected_daily, expected_pairs = brute_force(df, analyzer.top_k)
+
+    keys = ['commodity', 'date']
+    got = spreads.sort_values(keys).reset_index(drop=True)
+    pd.testing.assert_frame_equal(got[expected_daily.columns], expected_daily, check_dtype=False)
+    np.testing.assert_allclose(got['spread'], got['max_price'] - got['min_price'])
+
+    got_pairs = pairs.sort_values(keys + ['rank']).reset_index(drop=True)
+    pd.testing.assert_frame_equal(got_pairs[expected_pairs.columns], expected_pairs, check_dtype=False)
+
+
+def test_labels_carry_state(analyzer, make_prices):
+    df = make_prices()
+    spreads, pairs = analyzer.compute(df)
+    per_market = df.groupby(['commodity', 'date', 'market', 'state'])['modal_price'].mean()
+
+    # Har label (market, state) ek asli market hona chahiye jiska price match kare
+    for side, col in [('cheapest', 'min_price'), ('costliest', 'max_price')]:
+        looked_up = per_market.loc[list(zip(spreads['commodity'], spreads['date'],
+                                            spreads[f'{side}_market'], spreads[f'{side}_state']))]
+        np.testing.assert_allclose(looked_up.to_numpy(), spreads[col].to_numpy())
+    for side in ['buy', 'sell']:
+        looked_up = per_market.loc[list(zip(pairs['commodity'], pairs['date'],
+                                            pairs[f'{side}_market'], pairs[f'{side}_state']))]
+        np.testing.assert_allclose(looked_up.to_numpy(), pairs[f'{side}_price'].to_numpy())
+
+    # Same naam, alag state wale markets bhi ek pair ban sakte hain
+    same_name = pairs[pairs['buy_market'] == pairs['sell_market']]
+    assert (same_name['buy_state'] != same_name['sell_state']).all()
+
+
+def test_equal_prices_make_no_pairs(analyzer):
+    df = pd.DataFrame({
+        'commodity': 'Onion',
+        'state': 'Kerala',
+        'market': ['M0', 'M1', 'M2', 'M0', 'M1', 'M2'],
+        'date': pd.to_datetime(['2025-01-01'] * 3 + ['2025-01-02'] * 3),
+        'modal_price': [1000.0, 1000.0, 1000.0, 1000.0, 1000.0, 1200.0],
+    })
+    spreads, pairs = analyzer.compute(df)
+
+    assert spreads['spread'].tolist() == [0.0, 200.0]
+    # Pehle din sab barabar: koi pair nahi; doosre din sirf M2 ke saath do pairs
+    assert pairs['date'].tolist() == [pd.Timestamp('2025-01-02')] * 2
+    assert (pairs['spread'] > 0).all()
+    assert sorted(pairs['buy_market']) == ['M0', 'M1']
+    assert set(pairs['sell_market']) == {'M2'}
+
+
+def test_rolling_windows_use_calendar_days(analyzer, make_prices):
+    df = make_prices()
+    # Onion ke kuch din gaayab: commodity-day window aur calendar window alag hongi
+    gaps = pd.to_datetime(['2025-01-04', '2025-01-05', '2025-01-06', '2025-01-12'])
+    df = df[~((df['commodity'] == 'Onion') & df['date'].isin(gaps))]
+    spreads, _ = analyzer.compute(df)
+
+    for window in analyzer.rolling_windows:
+        for row in spreads.itertuples():
+            history = spreads[(spreads['commodity'] == row.commodity) &
+                              (spreads['date'] > row.date - pd.Timedelta(days=window)) &
+                              (spreads['date'] <= row.date)]
+            assert getattr(row, f'spread_{window}day_avg') == pytest.approx(history['spread'].mean())
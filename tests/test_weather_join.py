@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from weather_join import WeatherJoiner
+
+
+@pytest.fixture
+def joiner():
+    # Delhi station: din mein ek observation, 06:00 par
+    stamps = pd.to_datetime(['2025-01-01 06:00', '2025-01-02 06:00',
+                             '2025-01-05 06:00', '2025-01-06 06:00'])
+    pd.DataFrame({
+        'city': 'Delhi',
+        'timestamp': stamps.strftime('%Y-%m-%d %H:%M:%S'),
+        'temperature': [10.0, 12.0, 14.0, 16.0],
+        'humidity': [50.0, 55.0, 60.0, 65.0],
+        'pressure': 1010.0,
+        'rainfall': [1.0, 2.0, 4.0, 8.0],
+    }).to_csv('weather.csv', index=False)
+    return WeatherJoiner(weather_file='weather.csv', tolerance_days=7)
+
+
+def prices(dates):
+    return pd.DataFrame({
+        'commodity': 'Onion',
+        'state': 'Delhi',
+        'date': pd.to_datetime(dates),
+        'modal_price': 1000.0,
+    })
+
+
+def test_backward_match_within_tolerance(joiner):
+    out = joiner.join_weather(prices(['2025-01-03', '2025-01-09']))
+    # 2025-01-03 midnight -> 2025-01-02 06:00 ka observation
+    assert out['temperature'].tolist() == [12.0, 16.0]
+
+
+def test_no_match_outside_tolerance_or_same_day(joiner):
+    out = joiner.join_weather(prices(['2025-01-01', '2025-01-20']))
+    # 2025-01-01 midnight se pehle koi observation nahi (06:00 wala future hai);
+    # 2025-01-20 ka latest observation 7 din se purana
+    assert out['temperature'].isna().all()
+
+
+def test_keeps_original_row_order(joiner):
+    df = prices(['2025-01-09', '2025-01-01', '2025-01-03'])
+    df.index = [10, 5, 7]
+    out = joiner.join_weather(df)
+    assert out.index.tolist() == [10, 5, 7]
+    assert out['date'].tolist() == df['date'].tolist()
+    np.testing.assert_array_equal(out['temperature'].to_numpy(), [16.0, np.nan, 12.0])
+
+
+def test_rolling_rainfall_matches_hand_sums(joiner):
+    weather = joiner.prepare_weather().set_index('timestamp')
+    # 3D window (t-3d, t]: 01-05 06:00 -> sirf 01-05 (01-02 06:00 boundary par bahar)
+    # 7D window: 01-06 06:00 -> 01-01 + 01-02 + 01-05 + 01-06
+    expected_3day = [1.0, 3.0, 4.0, 12.0]
+    expected_7day = [1.0, 3.0, 7.0, 15.0]
+    assert weather['rainfall_3day'].tolist() == expected_3day
+    assert weather['rainfall_7day'].tolist() == expected_7day
+
+
+def test_mixed_datetime_units(joiner):
+    # Weather CSV se parse hua timestamp aur price 'date' alag units mein ho sakte hain
+    df = prices(['2025-01-03', '2025-01-06'])
+    df['date'] = df['date'].astype('datetime64[ns]')
+    out = joiner.join_weather(df)
+    assert out['temperature'].tolist() == [12.0, 14.0]
+
+    df['date'] = df['date'].astype('datetime64[us]')
+    out = joiner.join_weather(df)
+    assert out['temperature'].tolist() == [12.0, 14.0]